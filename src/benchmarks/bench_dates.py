@@ -0,0 +1,84 @@
+"""Benchmark del costo por fila de obtener la fecha de un tweet en q1.
+
+Uso (desde la carpeta src):
+    python -m benchmarks.bench_dates farmers-protest-tweets-2021-2-4.json --repeat 3 --tz America/Argentina/Buenos_Aires
+"""
+# imports nativos
+from typing import Callable, List
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import argparse
+import time
+
+# imports externas
+from rich.console import Console
+from rich.table import Table
+
+# imports propios
+from utils.readers import process_tweets
+from utils.aggregators import TopDatesUserAccumulator
+
+
+def time_key(key: Callable[[str], object], dates: List[str], repeat: int) -> float:
+    """Mide el mejor tiempo de calcular la clave de fecha de todas las filas.
+
+    Parameters:
+        key (Callable): Función que recibe el campo `date` y devuelve la clave
+        dates (List[str]): Campos `date` de los tweets
+        repeat (int): Cantidad de repeticiones
+    Returns:
+        float: Mejor tiempo en segundos
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for value in dates:
+            key(value)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('file_path', help='Ruta al archivo NDJSON')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones por variante')
+    parser.add_argument('--tz', default='UTC', help='Zona horaria para la variante con conversión')
+    args = parser.parse_args()
+
+    dates = [
+        tweet['date']
+        for tweet in process_tweets(args.file_path)
+        if isinstance(tweet.get('date'), str)
+    ]
+    tz = ZoneInfo(args.tz)
+
+    variants = {
+        'strptime (anterior)': lambda value: datetime.strptime(value[:10], '%Y-%m-%d').date(),
+        'prefijo YYYY-MM-DD': lambda value: value[:10],
+        f'zona {args.tz}': TopDatesUserAccumulator(tz)._local_day,
+    }
+
+    table = Table(title="📅 [bold]Clave de fecha en q1[/bold]", show_header=True, header_style="bold magenta")
+    table.add_column("Variante", style="cyan")
+    table.add_column("Tiempo", justify="right")
+    table.add_column("ns/fila", justify="right")
+    table.add_column("Speedup", justify="right")
+
+    reference = None
+    for name, key in variants.items():
+        elapsed = time_key(key, dates, args.repeat)
+        reference = reference or elapsed
+        table.add_row(
+            name,
+            f"{elapsed:.4f} s",
+            f"{elapsed / len(dates) * 1e9:,.0f}",
+            f"{reference / elapsed:.2f}x"
+        )
+
+    console = Console()
+    console.print(table)
+    console.print(f"Filas: {len(dates):,}")
+
+
+if __name__ == "__main__":
+    main()
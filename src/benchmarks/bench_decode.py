@@ -0,0 +1,88 @@
+"""Benchmark de la decodificación por lotes frente a la decodificación línea por línea.
+
+Compara `process_tweets` (ujson, una llamada por línea) con `decode_batches`
+para cada decodificador instalado (ujson y orjson) y cada tamaño de lote.
+
+Uso (desde la carpeta src):
+    python -m benchmarks.bench_decode farmers-protest-tweets-2021-2-4.json --repeat 3
+    python -m benchmarks.bench_decode tweets.json --batch-sizes 32 128 512
+"""
+# imports nativos
+from typing import Callable, Iterable
+import argparse
+import importlib.util
+import time
+
+# imports externas
+from rich.console import Console
+from rich.table import Table
+
+# imports propios
+from utils import readers
+from utils.readers import process_tweets, decode_batches
+
+
+def time_reader(reader: Callable[[], Iterable[list]], repeat: int) -> tuple[float, int]:
+    """Mide el mejor tiempo de consumir un lector completo.
+
+    Parameters:
+        reader (Callable): Función que devuelve un generador de lotes de tweets
+        repeat (int): Cantidad de repeticiones
+    Returns:
+        tuple: (mejor tiempo en segundos, filas leídas)
+    """
+    best = float('inf')
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = sum(len(batch) for batch in reader())
+        best = min(best, time.perf_counter() - start)
+    return best, rows
+
+
+def decoders() -> dict:
+    """Funciones `loads` de los decodificadores instalados."""
+    import ujson
+    found = {'ujson': ujson.loads}
+    if importlib.util.find_spec('orjson') is not None:
+        import orjson
+        found['orjson'] = orjson.loads
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('file_path', help='Ruta al archivo NDJSON')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones por lector')
+    parser.add_argument('--batch-sizes', type=int, nargs='*', default=[32, 128, 512], help='Líneas por lote')
+    args = parser.parse_args()
+
+    # `process_tweets` se mide con lotes de un tweet
+    base_time, rows = time_reader(lambda: ([tweet] for tweet in process_tweets(args.file_path)), args.repeat)
+
+    table = Table(title="⏱️ [bold]Decodificación por lotes vs línea por línea[/bold]", show_header=True, header_style="bold magenta")
+    table.add_column("Lector", style="cyan")
+    table.add_column("Decodificador")
+    table.add_column("Lote", justify="right")
+    table.add_column("Tiempo", justify="right")
+    table.add_column("Filas/s", justify="right")
+    table.add_column("Speedup", justify="right")
+
+    table.add_row("process_tweets", "ujson", "1", f"{base_time:.4f} s", f"{rows / base_time:,.0f}", "1.00x")
+
+    default_loads = readers._batch_loads
+    try:
+        for name, loads in decoders().items():
+            readers._batch_loads = loads
+            for batch_size in args.batch_sizes:
+                elapsed, _ = time_reader(lambda: decode_batches(args.file_path, batch_size=batch_size), args.repeat)
+                table.add_row("decode_batches", name, f"{batch_size:,}", f"{elapsed:.4f} s",
+                              f"{rows / elapsed:,.0f}", f"{base_time / elapsed:.2f}x")
+    finally:
+        readers._batch_loads = default_loads
+
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Micro-benchmark de extract_emojis frente a emoji.emoji_list.
+
+Uso (desde la carpeta src):
+    python -m benchmarks.bench_emoji farmers-protest-tweets-2021-2-4.json --repeat 3
+"""
+# imports nativos
+from typing import Callable, List
+import argparse
+import time
+
+# imports externas
+import emoji
+from rich.console import Console
+from rich.table import Table
+
+# imports propios
+from utils.readers import process_tweets
+from utils.extract_emoji import extract_emojis
+
+
+def emoji_list_extract(text: str) -> List[str]:
+    """Implementación de referencia: un diccionario por emoji encontrado."""
+    return [e['emoji'] for e in emoji.emoji_list(text)]
+
+
+def time_extractor(extractor: Callable[[str], List[str]], texts: List[str], repeat: int) -> float:
+    """Mide el mejor tiempo de aplicar el extractor a todos los textos.
+
+    Parameters:
+        extractor (Callable): Función de extracción
+        texts (List[str]): Textos de los tweets
+        repeat (int): Cantidad de repeticiones
+    Returns:
+        float: Mejor tiempo en segundos
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            extractor(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('file_path', help='Ruta al archivo NDJSON')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones por extractor')
+    args = parser.parse_args()
+
+    texts = [
+        tweet['renderedContent']
+        for tweet in process_tweets(args.file_path)
+        if isinstance(tweet.get('renderedContent'), str)
+    ]
+
+    # Antes de medir, verifico que ambos extractores devuelven lo mismo
+    mismatches = sum(1 for text in texts if extract_emojis(text) != emoji_list_extract(text))
+    with_emoji = sum(1 for text in texts if extract_emojis(text))
+
+    reference = time_extractor(emoji_list_extract, texts, args.repeat)
+    elapsed = time_extractor(extract_emojis, texts, args.repeat)
+
+    table = Table(title="😀 [bold]Extracción de emojis[/bold]", show_header=True, header_style="bold magenta")
+    table.add_column("Extractor", style="cyan")
+    table.add_column("Tiempo", justify="right")
+    table.add_column("Textos/s", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_row("emoji.emoji_list", f"{reference:.4f} s", f"{len(texts) / reference:,.0f}", "1.00x")
+    table.add_row("extract_emojis", f"{elapsed:.4f} s", f"{len(texts) / elapsed:,.0f}", f"{reference / elapsed:.2f}x")
+
+    console = Console()
+    console.print(table)
+    console.print(f"Textos: {len(texts):,} | con emojis: {with_emoji:,} | diferencias: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
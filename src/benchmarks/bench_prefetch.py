@@ -0,0 +1,119 @@
+"""Benchmark de la lectura anticipada en segundo plano frente a `process_tweets`.
+
+Compara el lector actual (mmap, todo en el mismo hilo) con la lectura por
+bloques en el mismo hilo (`depth=0`) y con la lectura anticipada para cada
+combinación de tamaño de bloque y profundidad de la cola. Con `--cold` el
+archivo se quita de la caché de páginas antes de cada repetición, así que
+se mide la lectura real del disco. Con `--delay-ms` cada lectura de bloque
+espera además ese tiempo, sin tomar el GIL, para simular la latencia de un
+volumen montado por red; la demora no se puede aplicar al lector con mmap.
+
+Uso (desde la carpeta src):
+    python -m benchmarks.bench_prefetch farmers-protest-tweets-2021-2-4.json --repeat 3 --cold
+    python -m benchmarks.bench_prefetch tweets.json --block-sizes 256 1024 4096 --depths 2 8 --delay-ms 5
+"""
+# imports nativos
+from typing import Callable, Iterable, Optional
+import argparse
+import os
+import time
+
+# imports externas
+from rich.console import Console
+from rich.table import Table
+
+# imports propios
+from utils import readers
+from utils.readers import process_tweets
+from utils.prefetch import Prefetch
+
+
+def evict(file_path: str) -> None:
+    """Quita el archivo de la caché de páginas del sistema operativo (solo Linux)."""
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def time_reader(reader: Callable[[], Iterable[dict]], repeat: int, cold_path: Optional[str]) -> tuple[float, int]:
+    """Mide el mejor tiempo de consumir un lector completo.
+
+    Parameters:
+        reader (Callable): Función que devuelve un generador de tweets
+        repeat (int): Cantidad de repeticiones
+        cold_path (Optional[str]): Archivo a quitar de la caché antes de cada repetición
+    Returns:
+        tuple: (mejor tiempo en segundos, filas leídas)
+    """
+    best = float('inf')
+    rows = 0
+    for _ in range(repeat):
+        if cold_path is not None:
+            evict(cold_path)
+        start = time.perf_counter()
+        rows = sum(1 for _ in reader())
+        best = min(best, time.perf_counter() - start)
+    return best, rows
+
+
+def delay_blocks(delay: float) -> None:
+    """Hace que cada lectura de bloque de `readers` espere `delay` segundos."""
+    file_blocks = readers._file_blocks
+
+    def slow_file_blocks(*args, **kwargs):
+        for block in file_blocks(*args, **kwargs):
+            time.sleep(delay)
+            yield block
+
+    readers._file_blocks = slow_file_blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('file_path', help='Ruta al archivo NDJSON')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones por lector')
+    parser.add_argument('--block-sizes', type=int, nargs='*', default=[256, 1024, 4096], help='Tamaños de bloque en KiB')
+    parser.add_argument('--depths', type=int, nargs='*', default=[2, 8], help='Profundidades de la cola')
+    parser.add_argument('--cold', action='store_true', help='Quitar el archivo de la caché antes de cada repetición')
+    parser.add_argument('--delay-ms', type=float, default=0, help='Demora simulada por lectura de bloque (ms)')
+    args = parser.parse_args()
+
+    cold_path = args.file_path if args.cold else None
+    if args.delay_ms:
+        delay_blocks(args.delay_ms / 1000)
+
+    table = Table(title="⏱️ [bold]Lectura anticipada vs process_tweets[/bold]", show_header=True, header_style="bold magenta")
+    table.add_column("Lector", style="cyan")
+    table.add_column("Bloque", justify="right")
+    table.add_column("Cola", justify="right")
+    table.add_column("Tiempo", justify="right")
+    table.add_column("Filas/s", justify="right")
+    table.add_column("MB/s", justify="right")
+    table.add_column("Speedup", justify="right")
+
+    size_mb = os.path.getsize(args.file_path) / 1_000_000
+    base_time, rows = time_reader(lambda: process_tweets(args.file_path), args.repeat, cold_path)
+    table.add_row("process_tweets (mmap)", "-", "-", f"{base_time:.4f} s", f"{rows / base_time:,.0f}",
+                  f"{size_mb / base_time:,.1f}", "1.00x")
+
+    for block_kib in args.block_sizes:
+        for depth in [0, *args.depths]:
+            prefetch = Prefetch(block_kib * 1024, depth)
+            elapsed, _ = time_reader(lambda: process_tweets(args.file_path, prefetch=prefetch), args.repeat, cold_path)
+            table.add_row(
+                "bloques, mismo hilo" if depth == 0 else "lectura anticipada",
+                f"{block_kib:,} KiB",
+                str(depth),
+                f"{elapsed:.4f} s",
+                f"{rows / elapsed:,.0f}",
+                f"{size_mb / elapsed:,.1f}",
+                f"{base_time / elapsed:.2f}x",
+            )
+
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
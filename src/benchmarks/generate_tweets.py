@@ -0,0 +1,209 @@
+"""Generador determinista de tweets sintéticos en NDJSON.
+
+Escribe tweets con los campos que usan las consultas (`date`,
+`user.username`, `content`/`renderedContent` con emojis y `mentionedUsers`)
+para medir el escalamiento sin el archivo original. Usuarios, menciones y
+emojis siguen distribuciones de Zipf; con la misma semilla y los mismos
+parámetros el archivo generado es idéntico byte a byte. Las filas se
+escriben por lotes, así que la memoria no depende de la cantidad de filas.
+
+Uso (desde la carpeta src):
+    python -m benchmarks.generate_tweets synthetic.json --rows 1000000 --malformed-rate 0.001
+"""
+# imports nativos
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+import argparse
+import random
+import time
+
+# imports externas
+from emoji import EMOJI_DATA, STATUS
+from rich.console import Console
+import ujson
+
+
+# Emojis más frecuentes en el dataset original, en orden; el resto de la
+# distribución se completa con los emojis de una sola persona de `emoji`
+COMMON_EMOJIS = [
+    '🙏', '😂', '🚜', '🌾', '🇮🇳', '❤️', '👍', '😭', '💪', '👉',
+    '🔥', '🙏🏻', '✊', '💚', '😡', '👇', '🤣', '🙌', '😊', '🇨🇦',
+]
+
+WORDS = [
+    'farmers', 'protest', 'india', 'delhi', 'support', 'government', 'laws', 'kisan',
+    'tractor', 'rally', 'border', 'march', 'rights', 'stand', 'with', 'the', 'for',
+    'and', 'today', 'news', 'police', 'internet', 'voice', 'peaceful', 'justice',
+]
+
+START_DATE = datetime(2021, 2, 4, tzinfo=timezone.utc)
+
+# Filas que se escriben juntas en cada llamada a `write`
+BATCH_ROWS = 10_000
+
+
+class TweetGenerator:
+    """Genera tweets sintéticos con una semilla fija.
+
+    Parameters:
+        seed (int): Semilla del generador aleatorio
+        users (int): Cantidad de usuarios distintos
+        zipf (float): Exponente de Zipf de autores, menciones y emojis (mayor = más concentrado)
+        days (int): Días cubiertos a partir de `START_DATE`
+        emoji_rate (float): Probabilidad de que un tweet tenga emojis
+        mention_rate (float): Probabilidad de que un tweet tenga menciones
+        malformed_rate (float): Proporción de líneas con JSON inválido
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        users: int = 100_000,
+        zipf: float = 1.1,
+        days: int = 30,
+        emoji_rate: float = 0.3,
+        mention_rate: float = 0.4,
+        malformed_rate: float = 0.0
+    ):
+        self.random = random.Random(seed)
+        self.days = days
+        self.emoji_rate = emoji_rate
+        self.mention_rate = mention_rate
+        self.malformed_rate = malformed_rate
+        self.next_id = 1
+
+        self.usernames = [f"user{rank}" for rank in range(users)]
+        self.user_weights = zipf_weights(users, zipf)
+
+        tail = sorted(
+            symbol for symbol, data in EMOJI_DATA.items()
+            if data['status'] == STATUS['fully_qualified'] and len(symbol) == 1 and symbol not in COMMON_EMOJIS
+        )
+        self.emojis = COMMON_EMOJIS + tail
+        self.emoji_weights = zipf_weights(len(self.emojis), zipf)
+
+    def tweet(self) -> dict:
+        """Genera el siguiente tweet."""
+        rnd = self.random
+        tweet_id = self.next_id
+        self.next_id += 1
+
+        author = self._users(1)[0]
+        mentions = self._users(rnd.randint(1, 4)) if rnd.random() < self.mention_rate else []
+        emojis = (
+            rnd.choices(self.emojis, cum_weights=self.emoji_weights, k=rnd.randint(1, 6))
+            if rnd.random() < self.emoji_rate else []
+        )
+
+        words = rnd.choices(WORDS, k=rnd.randint(4, 20))
+        content = ' '.join(
+            [f"@{username}" for username in mentions] + words + emojis
+        )
+        date = START_DATE + timedelta(seconds=rnd.randrange(self.days * 86400))
+
+        return {
+            'url': f"https://twitter.com/{author}/status/{tweet_id}",
+            'date': date.isoformat(),
+            'content': content,
+            'renderedContent': content,
+            'id': tweet_id,
+            'user': {
+                'username': author,
+                'displayname': author.capitalize(),
+                'id': _user_id(author),
+                'followersCount': rnd.randrange(10_000),
+            },
+            'mentionedUsers': [
+                {
+                    'username': username,
+                    'displayname': username.capitalize(),
+                    'id': _user_id(username),
+                    'description': None,
+                    'url': f"https://twitter.com/{username}",
+                }
+                for username in mentions
+            ] or None,
+        }
+
+    def line(self) -> str:
+        """Genera la siguiente línea NDJSON, inválida con probabilidad `malformed_rate`."""
+        line = ujson.dumps(self.tweet(), ensure_ascii=False, escape_forward_slashes=False)
+        if self.malformed_rate and self.random.random() < self.malformed_rate:
+            # Línea cortada a la mitad, como una escritura interrumpida
+            line = line[:self.random.randrange(1, len(line) - 1)]
+        return line
+
+    def _users(self, k: int) -> list:
+        return self.random.choices(self.usernames, cum_weights=self.user_weights, k=k)
+
+
+def zipf_weights(n: int, exponent: float) -> list:
+    """Pesos acumulados de una distribución de Zipf sobre `n` rangos, para
+    usar con `random.choices(..., cum_weights=...)` (búsqueda binaria).
+
+    Parameters:
+        n (int): Cantidad de elementos
+        exponent (float): Exponente de Zipf
+    Returns:
+        list: Pesos acumulados
+    """
+    return list(accumulate(1 / rank ** exponent for rank in range(1, n + 1)))
+
+
+def _user_id(username: str) -> int:
+    return int(username[len('user'):])
+
+
+def generate_tweets(file_path: str, rows: int, **options) -> int:
+    """Escribe `rows` tweets sintéticos en un archivo NDJSON.
+
+    Parameters:
+        file_path (str): Ruta del archivo a escribir
+        rows (int): Cantidad de líneas
+        **options: Parámetros de `TweetGenerator`
+    Returns:
+        int: Bytes escritos
+    """
+    generator = TweetGenerator(**options)
+    written = 0
+    with open(file_path, 'wb') as f:
+        for batch_start in range(0, rows, BATCH_ROWS):
+            batch = [generator.line() for _ in range(min(BATCH_ROWS, rows - batch_start))]
+            written += f.write(('\n'.join(batch) + '\n').encode('utf-8'))
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('file_path', help='Archivo NDJSON a escribir')
+    parser.add_argument('--rows', type=int, default=10_000, help='Cantidad de tweets')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla')
+    parser.add_argument('--users', type=int, default=100_000, help='Usuarios distintos')
+    parser.add_argument('--zipf', type=float, default=1.1, help='Exponente de Zipf')
+    parser.add_argument('--days', type=int, default=30, help='Días cubiertos')
+    parser.add_argument('--emoji-rate', type=float, default=0.3, help='Proporción de tweets con emojis')
+    parser.add_argument('--mention-rate', type=float, default=0.4, help='Proporción de tweets con menciones')
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help='Proporción de líneas inválidas')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    written = generate_tweets(
+        args.file_path,
+        args.rows,
+        seed=args.seed,
+        users=args.users,
+        zipf=args.zipf,
+        days=args.days,
+        emoji_rate=args.emoji_rate,
+        mention_rate=args.mention_rate,
+        malformed_rate=args.malformed_rate,
+    )
+    elapsed = time.perf_counter() - start
+    Console().print(
+        f"{args.rows:,} tweets ({written / 1024 / 1024:,.1f} MB) escritos en {args.file_path} "
+        f"en {elapsed:.1f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""Benchmark de las funciones q* de cada motor sobre distintos tamaños de datos.
+
+Cada función se mide en un proceso nuevo (para que el pico de RSS sea solo
+suyo), con calentamientos y repeticiones cronometradas con `perf_counter`.
+El pico de tracemalloc se mide en otro proceso nuevo, así no se mezcla con
+el RSS ni con los tiempos. Los resultados se guardan en JSON o CSV
+y pueden compararse con una línea base para detectar regresiones.
+
+Uso (desde la carpeta src):
+    python -m benchmarks.harness farmers-protest-tweets-2021-2-4.json --sizes 10000 50000 \\
+        --repeat 3 --warmup 1 --output results.json --baseline baseline.json
+    python -m benchmarks.harness --synthetic 100000 1000000 --repeat 3
+"""
+# imports nativos
+from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import contextlib
+import csv
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+# imports externas
+from rich.console import Console
+from rich.table import Table
+
+# imports propios
+from .generate_tweets import generate_tweets
+from utils.tracing import set_sinks
+
+
+VARIANTS = ['time', 'memory', 'arrow']
+FUNCTIONS = [f"q{question}_{variant}" for question in (1, 2, 3) for variant in VARIANTS]
+
+# Fases (spans hijos) que registran `run_scan` y `run_queries`
+PHASES = ['connection', 'read', 'query']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('file_paths', nargs='*', help='Archivos NDJSON a medir')
+    parser.add_argument('--synthetic', type=int, nargs='*', default=[],
+                        help='Cantidad de filas de los archivos sintéticos a generar y medir')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla de los archivos sintéticos')
+    parser.add_argument('--sizes', type=int, nargs='*', default=[],
+                        help='Cantidad de filas: se mide el prefijo de cada archivo con esa cantidad de líneas')
+    parser.add_argument('--functions', nargs='*', default=FUNCTIONS, choices=FUNCTIONS, help='Funciones a medir')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones cronometradas')
+    parser.add_argument('--warmup', type=int, default=1, help='Ejecuciones previas sin cronometrar')
+    parser.add_argument('--no-tracemalloc', action='store_true', help='No medir el pico de tracemalloc')
+    parser.add_argument('--output', help='Archivo de resultados (.json o .csv)')
+    parser.add_argument('--baseline', help='Resultados previos (.json) con los que comparar')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Aumento relativo del tiempo mediano a partir del cual se marca una regresión')
+    args = parser.parse_args()
+    if not args.file_paths and not args.synthetic:
+        parser.error('Indicar archivos a medir o --synthetic')
+
+    console = Console()
+    with tempfile.TemporaryDirectory(prefix='bench-') as tmp_dir:
+        datasets = [
+            dataset
+            for file_path in args.file_paths
+            for dataset in prepare_datasets(file_path, args.sizes, tmp_dir)
+        ]
+        for rows in sorted(set(args.synthetic)):
+            console.print(f"Generando {rows:,} tweets sintéticos...")
+            path = os.path.join(tmp_dir, f"synthetic-{rows}.json")
+            generate_tweets(path, rows, seed=args.seed)
+            datasets.append({'name': f"synthetic-seed{args.seed}", 'path': path, 'rows': rows})
+
+        records = []
+        for dataset in datasets:
+            for function in args.functions:
+                console.print(f"Midiendo [cyan]{function}[/cyan] sobre {dataset['rows']:,} filas...")
+                record = run_isolated(
+                    function, dataset['path'], args.repeat, args.warmup, not args.no_tracemalloc
+                )
+                records.append({'dataset': dataset['name'], 'rows': dataset['rows'], **record})
+
+    baseline = load_records(args.baseline) if args.baseline else []
+    regressions = compare_baseline(records, baseline, args.threshold)
+
+    console.print(results_table(records, regressions))
+    console.print(twins_table(records))
+    if args.output:
+        save_records(records, args.output)
+        console.print(f"Resultados guardados en {args.output}")
+    if regressions:
+        console.print(f"[red]{len(regressions)} regresiones respecto de {args.baseline}[/red]")
+        raise SystemExit(1)
+
+
+def prepare_datasets(file_path: str, sizes: List[int], tmp_dir: str) -> List[dict]:
+    """Arma los conjuntos de datos a medir: el archivo completo o, con
+    `sizes`, archivos temporales con sus primeras N líneas.
+
+    Parameters:
+        file_path (str): Archivo NDJSON de origen
+        sizes (List[int]): Cantidades de filas, vacío para usar el archivo completo
+        tmp_dir (str): Carpeta para los archivos temporales
+    Returns:
+        (List[dict]): Conjuntos con 'name', 'path' y 'rows'
+    """
+    name = os.path.basename(file_path)
+    with open(file_path, 'rb') as f:
+        total = sum(1 for _ in f)
+
+    if not sizes:
+        return [{'name': name, 'path': file_path, 'rows': total}]
+
+    datasets = []
+    for size in sorted(set(sizes)):
+        if size >= total:
+            datasets.append({'name': name, 'path': file_path, 'rows': total})
+            continue
+        path = os.path.join(tmp_dir, f"{size}-{name}")
+        with open(file_path, 'rb') as source, open(path, 'wb') as target:
+            for _, line in zip(range(size), source):
+                target.write(line)
+        datasets.append({'name': name, 'path': path, 'rows': size})
+    return datasets
+
+
+def run_isolated(function: str, file_path: str, repeat: int, warmup: int, trace: bool) -> dict:
+    """Mide una función en un proceso nuevo (ver `measure`) y, con `trace`,
+    mide el pico de tracemalloc en otro proceso nuevo (ver `trace_peak`).
+    """
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        record = executor.submit(measure, function, file_path, repeat, warmup).result()
+    record['tracemalloc_peak_mb'] = None
+    if trace:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            record['tracemalloc_peak_mb'] = executor.submit(trace_peak, function, file_path).result()
+    return record
+
+
+def measure(function: str, file_path: str, repeat: int, warmup: int) -> dict:
+    """Ejecuta la función con calentamientos y repeticiones y resume sus métricas.
+    El pico de RSS corresponde solo a estas ejecuciones, sin tracemalloc.
+
+    Returns:
+        dict: Tiempos (mediana, mínimo, desvío), fases medianas y pico de RSS
+    """
+    module = importlib.import_module(function)
+    target = getattr(module, function)
+
+    # Los spans se capturan en lugar de imprimirse como tablas
+    captured = []
+    set_sinks([SpanCollector(captured)])
+
+    for _ in range(warmup):
+        with contextlib.redirect_stdout(io.StringIO()):
+            target(file_path)
+
+    totals = []
+    phases = {name: [] for name in PHASES}
+    read_throughput = []
+    for _ in range(repeat):
+        captured.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            target(file_path)
+            totals.append(time.perf_counter() - start)
+        for child in captured[-1].children if captured else []:
+            if child.name in phases:
+                phases[child.name].append(child.duration)
+            if child.name == 'read' and child.mb_per_second is not None:
+                read_throughput.append(child.mb_per_second)
+
+    return {
+        'function': function,
+        'question': function.split('_')[0],
+        'variant': function.split('_')[1],
+        'repeat': repeat,
+        'median_s': statistics.median(totals),
+        'min_s': min(totals),
+        'stdev_s': statistics.stdev(totals) if len(totals) > 1 else 0.0,
+        **{f"{name}_s": statistics.median(values) if values else None for name, values in phases.items()},
+        'read_mb_per_s': statistics.median(read_throughput) if read_throughput else None,
+        # ru_maxrss está en KB en Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def trace_peak(function: str, file_path: str) -> float:
+    """Ejecuta la función una vez con tracemalloc activo. Se llama en un
+    proceso aparte porque tracemalloc ralentiza el código medido y agrega
+    su propia memoria al RSS.
+
+    Returns:
+        float: Pico de memoria asignada por Python, en MB
+    """
+    module = importlib.import_module(function)
+    target = getattr(module, function)
+    set_sinks([])
+
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            target(file_path)
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+class SpanCollector:
+    """Sink que guarda los spans raíz en una lista."""
+
+    def __init__(self, spans: list):
+        self.spans = spans
+
+    def export(self, root) -> None:
+        self.spans.append(root)
+
+
+def compare_baseline(records: List[dict], baseline: List[dict], threshold: float) -> Dict[tuple, float]:
+    """Compara el tiempo mediano contra la línea base.
+
+    Parameters:
+        records (List[dict]): Resultados actuales
+        baseline (List[dict]): Resultados previos
+        threshold (float): Aumento relativo tolerado
+    Returns:
+        (Dict[tuple, float]): Cambio relativo de cada (dataset, filas, función) que empeoró
+    """
+    previous = {(r['dataset'], int(r['rows']), r['function']): float(r['median_s']) for r in baseline}
+    regressions = {}
+    for record in records:
+        key = (record['dataset'], record['rows'], record['function'])
+        if key in previous:
+            change = record['median_s'] / previous[key] - 1
+            record['baseline_change'] = change
+            if change > threshold:
+                regressions[key] = change
+    return regressions
+
+
+def results_table(records: List[dict], regressions: Dict[tuple, float]) -> Table:
+    table = Table(title="⏱️ [bold]Benchmark de q1-q3[/bold]", show_header=True, header_style="bold magenta")
+    table.add_column("Función", style="cyan")
+    table.add_column("Filas", justify="right")
+    table.add_column("Mediana", justify="right")
+    table.add_column("Lectura", justify="right")
+    table.add_column("MB/s", justify="right")
+    table.add_column("Consulta", justify="right")
+    table.add_column("Pico RSS (MB)", justify="right")
+    table.add_column("tracemalloc (MB)", justify="right")
+    table.add_column("vs. base", justify="right")
+
+    for record in records:
+        change = record.get('baseline_change')
+        key = (record['dataset'], record['rows'], record['function'])
+        color = 'red' if key in regressions else 'green'
+        table.add_row(
+            record['function'],
+            f"{record['rows']:,}",
+            f"{record['median_s']:.4f} s",
+            _seconds(record['read_s']),
+            '' if record['read_mb_per_s'] is None else f"{record['read_mb_per_s']:,.1f}",
+            _seconds(record['query_s']),
+            f"{record['peak_rss_mb']:.1f}",
+            '' if record['tracemalloc_peak_mb'] is None else f"{record['tracemalloc_peak_mb']:.1f}",
+            '' if change is None else f"[{color}]{change:+.1%}[/{color}]",
+        )
+    return table
+
+
+def twins_table(records: List[dict]) -> Table:
+    """Compara los motores de cada pregunta: marca el más rápido e indica si
+    la variante de tiempo le gana a su variante de memoria."""
+    table = Table(title="⚖️ [bold]Motores por pregunta[/bold]", show_header=True, header_style="bold blue")
+    table.add_column("Pregunta", style="cyan")
+    table.add_column("Filas", justify="right")
+    for variant in VARIANTS:
+        table.add_column(variant, justify="right")
+    table.add_column("Más rápido", justify="center")
+    table.add_column("¿time < memory?", justify="center")
+
+    groups = {}
+    for record in records:
+        key = (record['dataset'], record['rows'], record['question'])
+        groups.setdefault(key, {})[record['variant']] = record['median_s']
+
+    for (dataset, rows, question), medians in groups.items():
+        fastest = min(medians, key=medians.get)
+        if 'time' in medians and 'memory' in medians:
+            beats = "[green]sí[/green]" if medians['time'] < medians['memory'] else "[red]no[/red]"
+        else:
+            beats = ''
+        table.add_row(
+            question,
+            f"{rows:,}",
+            *[_seconds(medians.get(variant)) for variant in VARIANTS],
+            fastest,
+            beats,
+        )
+    return table
+
+
+def save_records(records: List[dict], path: str) -> None:
+    if path.endswith('.csv'):
+        columns = list(dict.fromkeys(key for record in records for key in record))
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(records)
+        return
+    with open(path, 'w') as f:
+        json.dump(records, f, indent=2)
+
+
+def load_records(path: str) -> List[dict]:
+    if path.endswith('.csv'):
+        with open(path, newline='') as f:
+            return list(csv.DictReader(f))
+    with open(path) as f:
+        return json.load(f)
+
+
+def _seconds(value: Optional[float]) -> str:
+    return '' if value is None else f"{value:.4f} s"
+
+
+if __name__ == "__main__":
+    main()
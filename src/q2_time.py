@@ -1,100 +1,51 @@
 # imports nativos
-from typing import List, Tuple
-import time
+from typing import Iterable, List, Optional, Tuple
 
 # imports externas
-import duckdb
 from rich import print
 
 # imports propios
-from utils import init_metrics, print_performance_table, measure_memory
-from utils.extract_emoji import extract_emojis
-
-def q2_time(file_path: str) -> List[Tuple[str, int]]:
+from utils.readers import FilePaths
+from utils.filters import DateLike, make_filter
+from utils.duckdb_session import SessionManager
+from utils.duckdb_engine import run_queries, query_top_emojis
+
+
+def q2_time(
+    file_path: FilePaths,
+    cache_dir: Optional[str] = None,
+    sessions: Optional[SessionManager] = None,
+    memory_limit: Optional[str] = None,
+    temp_dir: Optional[str] = None,
+    n: int = 10,
+    start_date: Optional[DateLike] = None,
+    end_date: Optional[DateLike] = None,
+    users: Optional[Iterable[str]] = None
+) -> List[Tuple[str, int]]:
     """Función principal para procesar el contenido de un tweet y obtener los emojis más utilizados.
-    Esta funcion utiliza DuckDB para leer el archivo NDJSON y realizar consultas SQL
+    Esta funcion utiliza DuckDB para leer el archivo NDJSON y realizar consultas SQL,
+    delegando en `utils.duckdb_engine`.
 
     Parameters:
-        file_path (str): Ruta al archivo NDJSON
+        file_path (FilePaths): Ruta al archivo NDJSON, lista de rutas, patrón glob o carpeta
+        cache_dir (Optional[str]): Carpeta para la caché columnar (Parquet), None para no usarla
+        sessions (Optional[SessionManager]): Sesiones calientes de DuckDB para reutilizar la
+            tabla cargada entre llamadas, None para cargar el archivo en cada llamada
+        memory_limit (Optional[str]): Memoria máxima de DuckDB (por ejemplo '2GB') para correr
+            fuera de memoria sobre una base temporal en disco, None para la base en memoria
+        temp_dir (Optional[str]): Carpeta para la base temporal y lo que DuckDB vuelque a disco
+        n (int): Cantidad de emojis
+        start_date (Optional[DateLike]): Primera fecha incluida (date o 'YYYY-MM-DD'), None sin límite
+        end_date (Optional[DateLike]): Última fecha incluida, None sin límite
+        users (Optional[Iterable[str]]): Autores cuyos tweets se cuentan, None para todos
     Returns:
         (List[Tuple[str, int]]): Lista de tuplas (emoji, cantidad)
     """
-    # Variables para tracking de tiempo y memoria
-    time_metrics, mem_metrics = init_metrics()
-    
-    # Medición inicial de memoria
-    mem_metrics['before'] = measure_memory()
-    
-    result = []
-    
-    try:
-        # Etapa 1: Conexión
-        conn = duckdb.connect(database=':memory:')
-        mem_metrics['after_conn'] = measure_memory()
-        
-        # Etapa 2: Lectura del archivo
-        time_metrics['read_start'] = time.time()
-        read_query = f"""
-            create table farmers_protest_raw as 
-            select * from read_ndjson_auto('{file_path}')
-        """
-        conn.execute(read_query)
-
-        time_metrics['read_end'] = time.time()
-        mem_metrics['after_read'] = measure_memory()
-        
-        # Etapa 3: Análisis y consulta
-        time_metrics['query_start'] = time.time()
-        
-        # Registrar la función en DuckDB
-        conn.create_function(
-            name='extract_emojis',
-            function=extract_emojis,
-            return_type='VARCHAR[]', 
-            parameters=['VARCHAR']
-        )
-        
-        query = """
-            with emoji_data as (
-                select extract_emojis(renderedContent) as emojis 
-                from farmers_protest_raw
-                where content is not null
-            ),
-            unnested AS (
-                select unnest(emojis) as emoji_char
-                from emoji_data
-                where array_length(emojis) > 0
-            )
-            select 
-                emoji_char,
-                count(*) as count
-            from unnested
-            group by emoji_char
-            order by count desc
-            limit 10
-        """
-        
-        result = conn.execute(query).fetchall()
-        final_result = [(row[0], row[1]) for row in result]
-        
-        time_metrics['query_end'] = time.time()
-        mem_metrics['after_query'] = measure_memory()
-        
-        
-    except Exception as e:
-        print(f"Error al procesar el archivo: {e}")
-        final_result = []
-        
-    finally:
-        # Ante cualquier error, cierro la conexión
-        if 'conn' in locals():
-            conn.close()
-        
-        time_metrics['end_total'] = time.time()
-        # Imprimir tablas de rendimiento
-        print_performance_table(time_metrics, mem_metrics)
-        
-        return final_result
+    return run_queries(
+        file_path, [query_top_emojis], cache_dir=cache_dir, sessions=sessions,
+        memory_limit=memory_limit, temp_dir=temp_dir, n=n,
+        tweet_filter=make_filter(start_date, end_date, users)
+    )[0]
 
 
 if __name__ == "__main__":
@@ -104,4 +55,4 @@ if __name__ == "__main__":
 
     #Mostrar resultados
     print("\nRESULTADOS TIEMPO:")
-    print(resultados)
\ No newline at end of file
+    print(resultados)
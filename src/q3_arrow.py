@@ -0,0 +1,47 @@
+# imports nativos
+from typing import Iterable, List, Optional, Tuple
+
+# imports externas
+from rich import print
+
+# imports propios
+from utils.readers import FilePaths
+from utils.filters import DateLike, make_filter
+from utils.arrow_engine import run_batches, TopMentionsBatchAccumulator, BATCH_SIZE
+
+
+def q3_arrow(
+    file_path: FilePaths,
+    batch_size: int = BATCH_SIZE,
+    n: int = 10,
+    start_date: Optional[DateLike] = None,
+    end_date: Optional[DateLike] = None,
+    users: Optional[Iterable[str]] = None
+) -> List[Tuple[str, int]]:
+    """Función principal para procesar tweets y obtener los usuarios más mencionados.
+    Esta función lee el archivo NDJSON en lotes columnares de Arrow y los procesa con
+    kernels vectorizados, delegando en `utils.arrow_engine`.
+
+    Parameters:
+        file_path (FilePaths): Ruta al archivo NDJSON, lista de rutas, patrón glob o carpeta
+        batch_size (int): Bytes de NDJSON por lote
+        n (int): Cantidad de usuarios
+        start_date (Optional[DateLike]): Primera fecha incluida (date o 'YYYY-MM-DD'), None sin límite
+        end_date (Optional[DateLike]): Última fecha incluida, None sin límite
+        users (Optional[Iterable[str]]): Autores cuyos tweets se cuentan, None para todos
+    Returns:
+        (List[Tuple[str, int]]): Lista de tuplas (usuario, cantidad)
+    """
+    return run_batches(
+        file_path, [TopMentionsBatchAccumulator(n)], batch_size=batch_size,
+        tweet_filter=make_filter(start_date, end_date, users)
+    )[0]
+
+
+if __name__ == "__main__":
+    #Ejecutar la función
+    resultados = q3_arrow("farmers-protest-tweets-2021-2-4.json")
+
+    #Mostrar resultados
+    print("\nRESULTADOS ARROW:")
+    print(resultados)
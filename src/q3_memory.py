@@ -1,88 +1,56 @@
 # imports nativos
-from typing import List, Tuple, Generator
-from datetime import date
-from collections import Counter
-import time
+from typing import Iterable, List, Optional, Tuple
 
 # imports externas
-import ujson
 from rich import print
 
 # imports propios
-from utils import init_metrics, print_performance_table, measure_memory
-
-
-def q3_memory(file_path: str) -> List[Tuple[str, int]]:
-    """Función principal para procesar el contenido de un tweet y obtener los emojis más utilizados.
-    Esta funcion utiliza ujson para una carga rápida y un generador para procesar el archivo línea por línea.
+from utils.readers import FilePaths
+from utils.filters import DateLike, make_filter
+from utils.prefetch import Prefetch
+from utils.stream_engine import run_scan
+from utils.aggregators import TopMentionsAccumulator
+
+
+def q3_memory(
+    file_path: FilePaths,
+    workers: Optional[int] = 1,
+    max_counters: Optional[int] = None,
+    checkpoint_dir: Optional[str] = None,
+    n: int = 10,
+    start_date: Optional[DateLike] = None,
+    end_date: Optional[DateLike] = None,
+    users: Optional[Iterable[str]] = None,
+    prefetch: Optional[Prefetch] = None
+) -> List[Tuple[str, int]]:
+    """Función principal para procesar tweets y obtener los usuarios más mencionados.
+    Esta funcion utiliza ujson para una carga rápida y un generador para procesar el archivo línea por línea,
+    delegando en el escaneo compartido de `utils.stream_engine`.
     
     Parameters:
-        file_path (str): Ruta al archivo NDJSON
+        file_path (FilePaths): Ruta al archivo NDJSON, lista de rutas, patrón glob o carpeta
+        workers (Optional[int]): Procesos para el escaneo en paralelo, None para usar todos los núcleos
+        max_counters (Optional[int]): Contadores máximos en memoria para un conteo aproximado
+            (Space-Saving), None para el conteo exacto
+        checkpoint_dir (Optional[str]): Carpeta para guardar el estado y leer solo las líneas
+            agregadas en la próxima ejecución, None para escanear siempre completo
+        n (int): Cantidad de usuarios
+        start_date (Optional[DateLike]): Primera fecha incluida (date o 'YYYY-MM-DD'), None sin límite
+        end_date (Optional[DateLike]): Última fecha incluida, None sin límite
+        users (Optional[Iterable[str]]): Autores cuyos tweets se cuentan, None para todos
+        prefetch (Optional[Prefetch]): Tamaño de bloque y profundidad de la cola para leer por
+            adelantado en un hilo en segundo plano, None para leer en el mismo hilo
     Returns:
-        (List[Tuple[str, int]]): Lista de tuplas (emoji, cantidad)
-    """
-    # Inicializar métricas
-    time_metrics, mem_metrics = init_metrics()
-    
-    mem_metrics['before'] = measure_memory()
-    
-    try:
-        # Contadores para acumular resultados
-        username_counter = Counter()
-        
-        # Etapa 1: Lectura y procesamiento línea por línea
-        time_metrics['read_start'] = time.time()
-        
-        for tweet in process_tweets(file_path):
-            mentioned_users = tweet.get('mentionedUsers')  # Devuelve None si la clave no existe
-            
-            if not mentioned_users:  # Captura None y listas vacías
-                continue
-                
-            try:
-                usernames = [mention['username'] for mention in mentioned_users]
-                username_counter.update(usernames)
-            except (TypeError, KeyError):
-                # TypeError: Si algún mention no es diccionario
-                # KeyError: Si algún mention no tiene 'username'
-                continue
-        
-        mem_metrics['after_read'] = measure_memory()
-        time_metrics['read_end'] = time.time()
-        
-        # Etapa 2: Procesamiento de resultados
-        time_metrics['query_start'] = time.time()
-        
-        result = username_counter.most_common(10)
-        
-        time_metrics['query_end'] = time.time()
-        mem_metrics['after_query'] = measure_memory()
-        
-    except Exception as e:
-        print(f"Error al procesar el archivo: {e}")
-        result = []
-    
-    finally:
-        time_metrics['end_total'] = time.time()
-        print_performance_table(time_metrics, mem_metrics)
-        return result
-
-
-def process_tweets(file_path: str) -> Generator[Tuple[date, str], None, None]:
-    """Generador que lee el archivo línea por línea y extrae fecha y usuario
-    para cada tweet. Utiliza ujson para una carga rápida.
-
-    Parameters:
-        file_path (str): Ruta al archivo NDJSON
-    Yields:
-        (date, str): Tuplas (fecha, usuario)
+        (List[Tuple[str, int]]): Lista de tuplas (usuario, cantidad)
     """
-    with open(file_path, encoding='utf-8') as f:
-        for line in f:
-            try:
-                yield ujson.loads(line)  # Cargar el tweet
-            except (KeyError, ValueError, ujson.JSONDecodeError):
-                continue
+    return run_scan(
+        file_path,
+        [TopMentionsAccumulator(max_counters, n=n)],
+        workers=workers,
+        checkpoint_dir=checkpoint_dir,
+        tweet_filter=make_filter(start_date, end_date, users),
+        prefetch=prefetch
+    )[0]
 
 
 if __name__ == "__main__":
@@ -92,5 +60,3 @@ if __name__ == "__main__":
     #Mostrar resultados
     print("\nRESULTADOS MEMORIA:")
     print(resultados)
-
-
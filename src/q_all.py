@@ -0,0 +1,173 @@
+# imports nativos
+from typing import Callable, Dict, Iterable, Optional
+from datetime import tzinfo
+
+# imports externas
+from rich import print
+
+# imports propios
+from utils.readers import FilePaths
+from utils.filters import DateLike, make_filter
+from utils.prefetch import Prefetch
+from utils.stream_engine import run_scan
+from utils.duckdb_session import SessionManager
+from utils.duckdb_engine import (
+    run_queries,
+    query_top_dates_user,
+    query_top_emojis,
+    query_top_mentions,
+)
+from utils.aggregators import (
+    TopDatesUserAccumulator,
+    TopEmojisAccumulator,
+    TopMentionsAccumulator,
+)
+from utils.arrow_engine import (
+    run_batches,
+    BATCH_SIZE,
+    TopDatesUserBatchAccumulator,
+    TopEmojisBatchAccumulator,
+    TopMentionsBatchAccumulator,
+)
+
+
+def q_all_memory(
+    file_path: FilePaths,
+    workers: Optional[int] = 1,
+    max_counters: Optional[int] = None,
+    tz: Optional[tzinfo] = None,
+    checkpoint_dir: Optional[str] = None,
+    n: int = 10,
+    start_date: Optional[DateLike] = None,
+    end_date: Optional[DateLike] = None,
+    users: Optional[Iterable[str]] = None,
+    prefetch: Optional[Prefetch] = None
+) -> Dict[str, list]:
+    """Responde q1, q2 y q3 con un único escaneo en streaming del archivo.
+    Cada pregunta es un acumulador registrado sobre la misma lectura, por lo
+    que el archivo se decodifica una sola vez.
+
+    Parameters:
+        file_path (FilePaths): Ruta al archivo NDJSON, lista de rutas, patrón glob o carpeta
+        workers (Optional[int]): Procesos para el escaneo en paralelo, None para usar todos los núcleos
+        max_counters (Optional[int]): Contadores máximos en memoria para un conteo aproximado
+            de q2 y q3 (Space-Saving), None para el conteo exacto
+        tz (Optional[tzinfo]): Zona horaria en la que se cuentan las fechas de q1, None para
+            usar la fecha local de cada tweet
+        checkpoint_dir (Optional[str]): Carpeta para guardar el estado y leer solo las líneas
+            agregadas en la próxima ejecución, None para escanear siempre completo
+        n (int): Tamaño del ranking de cada pregunta
+        start_date (Optional[DateLike]): Primera fecha incluida (date o 'YYYY-MM-DD'), None sin límite
+        end_date (Optional[DateLike]): Última fecha incluida, None sin límite
+        users (Optional[Iterable[str]]): Autores cuyos tweets se cuentan, None para todos
+        prefetch (Optional[Prefetch]): Tamaño de bloque y profundidad de la cola para leer por
+            adelantado en un hilo en segundo plano, None para leer en el mismo hilo
+    Returns:
+        (Dict[str, list]): Resultados indexados por pregunta ('q1', 'q2', 'q3')
+    """
+    q1, q2, q3 = run_scan(file_path, [
+        TopDatesUserAccumulator(tz, n),
+        TopEmojisAccumulator(max_counters, n),
+        TopMentionsAccumulator(max_counters, n),
+    ], workers=workers, checkpoint_dir=checkpoint_dir, tweet_filter=make_filter(start_date, end_date, users),
+        prefetch=prefetch)
+    return {'q1': q1, 'q2': q2, 'q3': q3}
+
+
+def q_all_time(
+    file_path: FilePaths,
+    cache_dir: Optional[str] = None,
+    sessions: Optional[SessionManager] = None,
+    memory_limit: Optional[str] = None,
+    temp_dir: Optional[str] = None,
+    n: int = 10,
+    start_date: Optional[DateLike] = None,
+    end_date: Optional[DateLike] = None,
+    users: Optional[Iterable[str]] = None
+) -> Dict[str, list]:
+    """Responde q1, q2 y q3 cargando el archivo una sola vez en DuckDB y
+    ejecutando las tres consultas sobre la misma tabla.
+
+    Parameters:
+        file_path (FilePaths): Ruta al archivo NDJSON, lista de rutas, patrón glob o carpeta
+        cache_dir (Optional[str]): Carpeta para la caché columnar (Parquet), None para no usarla
+        sessions (Optional[SessionManager]): Sesiones calientes de DuckDB para reutilizar la
+            tabla cargada entre llamadas, None para cargar el archivo en cada llamada
+        memory_limit (Optional[str]): Memoria máxima de DuckDB (por ejemplo '2GB') para correr
+            fuera de memoria sobre una base temporal en disco, None para la base en memoria
+        temp_dir (Optional[str]): Carpeta para la base temporal y lo que DuckDB vuelque a disco
+        n (int): Tamaño del ranking de cada pregunta
+        start_date (Optional[DateLike]): Primera fecha incluida (date o 'YYYY-MM-DD'), None sin límite
+        end_date (Optional[DateLike]): Última fecha incluida, None sin límite
+        users (Optional[Iterable[str]]): Autores cuyos tweets se cuentan, None para todos
+    Returns:
+        (Dict[str, list]): Resultados indexados por pregunta ('q1', 'q2', 'q3')
+    """
+    q1, q2, q3 = run_queries(file_path, [
+        query_top_dates_user,
+        query_top_emojis,
+        query_top_mentions,
+    ], cache_dir=cache_dir, sessions=sessions, memory_limit=memory_limit, temp_dir=temp_dir,
+        n=n, tweet_filter=make_filter(start_date, end_date, users))
+    return {'q1': q1, 'q2': q2, 'q3': q3}
+
+
+def q_all_arrow(
+    file_path: FilePaths,
+    batch_size: int = BATCH_SIZE,
+    n: int = 10,
+    start_date: Optional[DateLike] = None,
+    end_date: Optional[DateLike] = None,
+    users: Optional[Iterable[str]] = None
+) -> Dict[str, list]:
+    """Responde q1, q2 y q3 leyendo el archivo una sola vez en lotes
+    columnares de Arrow, con las columnas de las tres preguntas.
+
+    Parameters:
+        file_path (FilePaths): Ruta al archivo NDJSON, lista de rutas, patrón glob o carpeta
+        batch_size (int): Bytes de NDJSON por lote
+        n (int): Tamaño del ranking de cada pregunta
+        start_date (Optional[DateLike]): Primera fecha incluida (date o 'YYYY-MM-DD'), None sin límite
+        end_date (Optional[DateLike]): Última fecha incluida, None sin límite
+        users (Optional[Iterable[str]]): Autores cuyos tweets se cuentan, None para todos
+    Returns:
+        (Dict[str, list]): Resultados indexados por pregunta ('q1', 'q2', 'q3')
+    """
+    q1, q2, q3 = run_batches(file_path, [
+        TopDatesUserBatchAccumulator(n),
+        TopEmojisBatchAccumulator(n),
+        TopMentionsBatchAccumulator(n),
+    ], batch_size=batch_size, tweet_filter=make_filter(start_date, end_date, users))
+    return {'q1': q1, 'q2': q2, 'q3': q3}
+
+
+# Motores disponibles para `q_all`
+ENGINES: Dict[str, Callable[..., Dict[str, list]]] = {
+    'memory': q_all_memory,
+    'time': q_all_time,
+    'arrow': q_all_arrow,
+}
+
+
+def q_all(file_path: FilePaths, engine: str = 'time', **options) -> Dict[str, list]:
+    """Responde q1, q2 y q3 con el motor elegido en cada llamada.
+
+    Parameters:
+        file_path (FilePaths): Ruta al archivo NDJSON, lista de rutas, patrón glob o carpeta
+        engine (str): 'memory' (streaming en Python), 'time' (DuckDB) o 'arrow' (lotes columnares)
+        **options: Opciones propias del motor (por ejemplo `workers`, `cache_dir` o `batch_size`)
+    Returns:
+        (Dict[str, list]): Resultados indexados por pregunta ('q1', 'q2', 'q3')
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Motor desconocido: {engine}. Opciones: {', '.join(ENGINES)}")
+    return ENGINES[engine](file_path, **options)
+
+
+if __name__ == "__main__":
+    #Ejecutar la función
+    resultados = q_all_memory("farmers-protest-tweets-2021-2-4.json")
+
+    #Mostrar resultados
+    print("\nRESULTADOS MEMORIA:")
+    print(resultados)
@@ -0,0 +1,366 @@
+"""Servicio local de consultas sobre índices preagregados de tweets.
+
+Carga el dataset una sola vez (un archivo, una lista, un patrón glob o una
+carpeta) con el escaneo en streaming y construye índices por fecha (ver
+`utils.query_index`). Las consultas top N con cualquier `n` y rango de
+fechas se responden desde memoria, sin volver a leer el archivo. Un hilo
+vigila la entrada y reconstruye los índices cuando cambia; mientras tanto
+se siguen respondiendo consultas con los índices anteriores.
+
+Uso (desde la carpeta src):
+    python service.py farmers-protest-tweets-2021-2-4.json --port 8765
+    python service.py "shards/*.json" --socket /tmp/tweets.sock --checkpoint-dir .ckpt
+
+    curl "http://127.0.0.1:8765/q3?n=50&start=2021-02-10&end=2021-02-16"
+    curl --unix-socket /tmp/tweets.sock "http://localhost/q1?n=5"
+    curl -X POST "http://127.0.0.1:8765/reload"
+
+Rutas GET: /q1 (fechas y usuario más activo), /q2 (emojis), /q3 (menciones),
+/users (usuarios con más tweets) y /status. Las rutas de consulta aceptan
+`n`, `start` y `end` (fechas ISO, inclusivas). /reload solo acepta POST,
+porque puede reconstruir los índices: un GET recibe 405.
+"""
+# imports nativos
+from typing import Optional, Tuple
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import json
+import os
+import stat
+import threading
+import time
+
+# imports externas
+from rich.console import Console
+
+# imports propios
+from utils.readers import source_version, describe_paths, FilePaths
+from utils.stream_engine import run_scan
+from utils.query_index import TweetIndexAccumulator, TweetIndex
+
+
+# Segundos entre cada revisión de la entrada para la recarga en caliente
+RELOAD_INTERVAL = 5.0
+
+# Consulta de cada ruta: método de `TweetIndex`
+ROUTES = {
+    '/q1': 'top_dates',
+    '/q2': 'top_emojis',
+    '/q3': 'top_mentions',
+    '/users': 'top_users',
+}
+
+console = Console()
+
+
+class QueryService:
+    """Mantiene los índices de un dataset y los reconstruye cuando cambia.
+
+    Los índices se reemplazan de forma atómica: una consulta siempre ve la
+    versión anterior completa o la nueva completa. Con `checkpoint_dir` la
+    reconstrucción lee solo lo agregado a cada archivo desde la última
+    carga (ver `run_scan`).
+
+    Parameters:
+        file_path (FilePaths): Ruta al archivo NDJSON, lista de rutas, patrón glob o carpeta
+        workers (Optional[int]): Procesos para construir los índices, None para usar todos los núcleos
+        checkpoint_dir (Optional[str]): Carpeta para los checkpoints, None para escanear siempre completo
+        reload_interval (float): Segundos entre revisiones de la entrada, 0 para no recargar
+    """
+
+    def __init__(
+        self,
+        file_path: FilePaths,
+        workers: Optional[int] = 1,
+        checkpoint_dir: Optional[str] = None,
+        reload_interval: float = RELOAD_INTERVAL
+    ):
+        self.file_path = file_path
+        self.workers = workers
+        self.checkpoint_dir = checkpoint_dir
+        self.reload_interval = reload_interval
+        self.index: Optional[TweetIndex] = None
+        self.version = None
+        self.loaded_at = None
+        self.load_seconds = None
+        self.reloads = 0
+        self.lock = threading.Lock()  # Una sola reconstrucción a la vez
+        self._stop = threading.Event()
+        self._watcher = None
+
+    def load(self) -> bool:
+        """Construye los índices con la versión actual de la entrada.
+
+        Returns:
+            bool: True si los índices se reemplazaron
+        """
+        with self.lock:
+            version = source_version(self.file_path)
+            start = time.perf_counter()
+            index = run_scan(
+                self.file_path,
+                [TweetIndexAccumulator()],
+                workers=self.workers,
+                checkpoint_dir=self.checkpoint_dir
+            )[0]
+            if not isinstance(index, TweetIndex):  # El escaneo falló: conservo los índices anteriores
+                return False
+            self.index, self.version = index, version
+            self.load_seconds = time.perf_counter() - start
+            self.loaded_at = time.time()
+            self.reloads += 1
+            return True
+
+    def reload_if_changed(self) -> bool:
+        """Reconstruye los índices si la entrada cambió desde la última carga.
+
+        Returns:
+            bool: True si los índices se reemplazaron
+        """
+        try:
+            changed = source_version(self.file_path) != self.version
+        except OSError as e:
+            console.print(f"[red]No se pudo revisar la entrada: {e}[/red]")
+            return False
+        return changed and self.load()
+
+    def start_watcher(self) -> None:
+        """Revisa la entrada cada `reload_interval` segundos en un hilo en segundo plano."""
+        if self.reload_interval <= 0 or self._watcher is not None:
+            return
+
+        def watch():
+            while not self._stop.wait(self.reload_interval):
+                if self.reload_if_changed():
+                    console.print(f"Índices recargados: {self.index.rows:,} tweets en {self.load_seconds:.2f} s")
+
+        self._watcher = threading.Thread(target=watch, name='index-watcher', daemon=True)
+        self._watcher.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def query(self, route: str, n: int = 10, start: Optional[date] = None, end: Optional[date] = None) -> list:
+        """Responde una consulta top N con los índices vigentes.
+
+        Parameters:
+            route (str): Ruta de la consulta (ver `ROUTES`)
+            n (int): Tamaño del ranking
+            start (Optional[date]): Primera fecha del rango, None sin límite
+            end (Optional[date]): Última fecha del rango, None sin límite
+        Returns:
+            list: Resultado de la consulta
+        """
+        index = self.index
+        if index is None:
+            raise RuntimeError('Los índices todavía no están cargados')
+        return getattr(index, ROUTES[route])(n, start, end)
+
+    def status(self) -> dict:
+        index = self.index
+        return {
+            'source': describe_paths(self.file_path),
+            'files': len(self.version or ()),
+            'rows': None if index is None else index.rows,
+            'days': None if index is None else [day.isoformat() for day in index.days],
+            'loaded_at': self.loaded_at,
+            'load_seconds': self.load_seconds,
+            'reloads': self.reloads,
+        }
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """Atiende las rutas HTTP del servicio (`self.server.service`) con respuestas JSON."""
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        service = self.server.service
+
+        try:
+            if url.path == '/status':
+                return self._send(200, service.status())
+            if url.path == '/reload':
+                # Reconstruir los índices no puede depender de un GET (crawlers, prefetch)
+                return self._send(405, {'error': 'Usar POST para /reload'}, allow='POST')
+            if url.path not in ROUTES:
+                return self._send(404, {'error': f"Ruta desconocida: {url.path}", 'routes': [*ROUTES, '/status', 'POST /reload']})
+
+            try:
+                n, start, end = parse_params(url.query)
+            except ValueError as e:
+                return self._send(400, {'error': str(e)})
+
+            started = time.perf_counter()
+            try:
+                result = service.query(url.path, n, start, end)
+            except RuntimeError as e:
+                return self._send(503, {'error': str(e)})
+            elapsed_us = (time.perf_counter() - started) * 1_000_000
+            return self._send(200, {'result': result, 'elapsed_us': round(elapsed_us, 1)})
+        except Exception as e:
+            # Cualquier otro error se responde como JSON en lugar de cortar la conexión
+            console.print(f"[red]Error al atender {url.path}: {e!r}[/red]")
+            return self._send(500, {'error': f"Error interno: {e}"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        # El cuerpo no se usa, pero se consume para dejar la conexión limpia
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+        try:
+            if url.path == '/reload':
+                service = self.server.service
+                return self._send(200, {'reloaded': service.reload_if_changed(), **service.status()})
+            if url.path in ROUTES or url.path == '/status':
+                return self._send(405, {'error': f"Usar GET para {url.path}"}, allow='GET')
+            return self._send(404, {'error': f"Ruta desconocida: {url.path}", 'routes': ['POST /reload']})
+        except Exception as e:
+            console.print(f"[red]Error al atender {url.path}: {e!r}[/red]")
+            return self._send(500, {'error': f"Error interno: {e}"})
+
+    def address_string(self) -> str:
+        # En un socket Unix no hay dirección del cliente
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: dict, allow: Optional[str] = None) -> None:
+        payload = json.dumps(body, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        if allow is not None:
+            self.send_header('Allow', allow)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    """Servidor HTTP sobre un socket Unix, un hilo por conexión."""
+
+    daemon_threads = True
+
+
+def parse_params(query: str) -> Tuple[int, Optional[date], Optional[date]]:
+    """Lee `n`, `start` y `end` de la query string.
+
+    Parameters:
+        query (str): Query string de la URL
+    Returns:
+        tuple: (n, fecha inicial, fecha final)
+    Raises:
+        ValueError: Si algún parámetro es inválido
+    """
+    params = {key: values[-1] for key, values in parse_qs(query).items()}
+    try:
+        n = int(params.get('n', 10))
+    except ValueError:
+        raise ValueError(f"n debe ser un entero: {params['n']}")
+    if n < 0:
+        raise ValueError('n debe ser mayor o igual a 0')
+
+    bounds = []
+    for key in ('start', 'end'):
+        try:
+            bounds.append(date.fromisoformat(params[key]) if key in params else None)
+        except ValueError:
+            raise ValueError(f"{key} debe ser una fecha ISO (YYYY-MM-DD): {params[key]}")
+    return n, bounds[0], bounds[1]
+
+
+def make_server(
+    service: QueryService,
+    host: str = '127.0.0.1',
+    port: int = 8765,
+    socket_path: Optional[str] = None,
+    verbose: bool = False
+):
+    """Crea el servidor HTTP del servicio, en TCP o sobre un socket Unix.
+
+    Parameters:
+        service (QueryService): Servicio con los índices
+        host (str): Dirección en la que escuchar (TCP)
+        port (int): Puerto en el que escuchar (TCP), 0 para uno libre
+        socket_path (Optional[str]): Ruta del socket Unix; si se indica, no se usa TCP
+        verbose (bool): Si es True registra cada pedido en stderr
+    Returns:
+        Servidor listo para `serve_forever`
+    Raises:
+        FileExistsError: Si `socket_path` ya existe y no es un socket
+    """
+    if socket_path is not None:
+        remove_socket(socket_path)
+        server = UnixHTTPServer(socket_path, QueryHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), QueryHandler)
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def remove_socket(socket_path: str) -> None:
+    """Borra un socket Unix que quedó de una ejecución anterior. Cualquier
+    otro tipo de archivo se deja intacto.
+
+    Parameters:
+        socket_path (str): Ruta del socket
+    Raises:
+        FileExistsError: Si la ruta existe y no es un socket
+    """
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{socket_path} ya existe y no es un socket; no se borra")
+    os.remove(socket_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('file_path', nargs='+', help='Archivo NDJSON, patrón glob o carpeta (uno o más)')
+    parser.add_argument('--host', default='127.0.0.1', help='Dirección TCP')
+    parser.add_argument('--port', type=int, default=8765, help='Puerto TCP')
+    parser.add_argument('--socket', help='Socket Unix en lugar de TCP')
+    parser.add_argument('--workers', type=int, default=1, help='Procesos para construir los índices (0 = todos)')
+    parser.add_argument('--checkpoint-dir', help='Carpeta de checkpoints para recargar solo lo agregado')
+    parser.add_argument('--reload-interval', type=float, default=RELOAD_INTERVAL,
+                        help='Segundos entre revisiones de la entrada (0 = sin recarga)')
+    parser.add_argument('--verbose', action='store_true', help='Registrar cada pedido')
+    args = parser.parse_args()
+
+    file_path = args.file_path[0] if len(args.file_path) == 1 else args.file_path
+    service = QueryService(file_path, args.workers or None, args.checkpoint_dir, args.reload_interval)
+    if not service.load():
+        raise SystemExit(1)
+    console.print(f"Índices cargados: {service.index.rows:,} tweets en {service.load_seconds:.2f} s")
+
+    try:
+        server = make_server(service, args.host, args.port, args.socket, args.verbose)
+    except FileExistsError as e:
+        console.print(f"[red]{e}[/red]")
+        raise SystemExit(1)
+    address = args.socket or f"http://{args.host}:{server.server_address[1]}"
+    console.print(f"Escuchando en {address}")
+    service.start_watcher()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+        if args.socket is not None:
+            remove_socket(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Pruebas de equivalencia entre el motor de Arrow y la variante de memoria.
+
+Uso (desde la carpeta src):
+    python -m pytest tests
+"""
+# imports nativos
+import json
+
+# imports externas
+import pytest
+
+# imports propios
+from q1_arrow import q1_arrow
+from q1_memory import q1_memory
+from q_all import q_all_arrow, q_all_memory
+from utils.tracing import set_sinks
+
+
+@pytest.fixture(autouse=True)
+def no_sinks():
+    set_sinks([])
+
+
+def write_tweets(path, tweets) -> str:
+    with open(path, 'w') as f:
+        for tweet in tweets:
+            f.write(json.dumps(tweet) + '\n')
+    return str(path)
+
+
+def tweet(day: str, username, text: str = 'hola') -> dict:
+    return {
+        'date': f"{day}T10:00:00+00:00",
+        'user': {'username': username},
+        'renderedContent': text,
+        'mentionedUsers': None,
+    }
+
+
+def test_null_username_counts_in_both_engines(tmp_path):
+    # El usuario nulo es el más activo del 2021-02-12: ningún motor puede descartarlo
+    file_path = write_tweets(tmp_path / 'tweets.json', [
+        tweet('2021-02-12', None),
+        tweet('2021-02-12', 'ana'),
+        tweet('2021-02-12', None),
+        tweet('2021-02-13', 'luis'),
+        tweet('2021-02-13', None),
+    ])
+
+    expected = q1_memory(file_path)
+    assert [(day.isoformat(), user) for day, user in expected] == [('2021-02-12', None), ('2021-02-13', 'luis')]
+    assert q1_arrow(file_path) == expected
+    assert q1_arrow(file_path, batch_size=64) == expected
+
+
+def test_null_date_fails_only_q1_in_both_engines(tmp_path):
+    file_path = write_tweets(tmp_path / 'tweets.json', [
+        tweet('2021-02-12', 'ana', 'hola 😀'),
+        {**tweet('2021-02-12', 'luis', 'chau 😀'), 'date': None},
+    ])
+
+    expected = q_all_memory(file_path)
+    assert expected['q1'] == []
+    assert expected['q2'] == [('😀', 2)]
+    assert q_all_arrow(file_path) == expected
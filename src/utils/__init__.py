@@ -1,11 +1,25 @@
 from .utils import (
-    print_performance_table,
-    init_metrics,
     measure_memory,
+    set_metrics_enabled,
+    PeakMemorySampler,
+)
+from .tracing import (
+    span,
+    traced,
+    set_sinks,
+    ConsoleSink,
+    JsonLinesSink,
+    PrometheusSink,
 )
 
 __all__ = [
-    "print_performance_table",
-    "init_metrics",
     "measure_memory",
+    "set_metrics_enabled",
+    "PeakMemorySampler",
+    "span",
+    "traced",
+    "set_sinks",
+    "ConsoleSink",
+    "JsonLinesSink",
+    "PrometheusSink",
 ]
\ No newline at end of file
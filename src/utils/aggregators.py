@@ -0,0 +1,171 @@
+# imports nativos
+from typing import List, Optional, Tuple
+from datetime import datetime, date, timezone, tzinfo
+from collections import defaultdict
+import heapq
+
+# imports externas
+from rich import print
+
+# imports propios
+from .extract_emoji import extract_emojis
+from .heavy_hitters import SpaceSaving, new_counter
+
+
+class Accumulator:
+    """Interfaz de un acumulador registrado sobre el escaneo compartido.
+    Cada pregunta implementa `update` (se llama una vez por tweet),
+    `merge` (combina el estado parcial de otro acumulador del mismo tipo,
+    usado por el escaneo en paralelo) y `result` (se llama una sola vez al
+    terminar el escaneo).
+    """
+
+    def update(self, tweet: dict) -> None:
+        raise NotImplementedError
+
+    def merge(self, other: 'Accumulator') -> None:
+        raise NotImplementedError
+
+    def result(self) -> list:
+        raise NotImplementedError
+
+
+class TopDatesUserAccumulator(Accumulator):
+    """Q1: top n fechas con más tweets y el usuario más activo en cada una.
+
+    El estado es compacto: cada usuario se registra una sola vez y se
+    identifica con un entero. Las cuentas por fecha usan esos ids como
+    clave, que son el mismo objeto en todas las fechas, en lugar de guardar
+    una copia del nombre de usuario por fecha.
+
+    Las fechas se agrupan por el prefijo `YYYY-MM-DD` del texto, sin
+    parsearlo; solo las n fechas del resultado se convierten a `date`. Por
+    defecto es la fecha local en que se publicó el tweet (se ignora su
+    desplazamiento UTC). Con `tz` cada instante se convierte a esa zona
+    horaria antes de tomar la fecha.
+    """
+
+    def __init__(self, tz: Optional[tzinfo] = None, n: int = 10):
+        self.tz = tz
+        self.n = n
+        self.user_ids = {}  # usuario -> id
+        self.usernames = []  # id -> usuario
+        self.date_user_counts = defaultdict(dict)  # 'YYYY-MM-DD' -> {id: tweets}
+
+    def update(self, tweet: dict) -> None:
+        if self.tz is None:
+            day = tweet['date'][:10]  # Fecha local del tweet, sin parsear
+        else:
+            day = self._local_day(tweet['date'])
+        user_id = self._user_id(tweet['user']['username'])
+        user_counts = self.date_user_counts[day]
+        user_counts[user_id] = user_counts.get(user_id, 0) + 1
+
+    def merge(self, other: 'TopDatesUserAccumulator') -> None:
+        # Los ids del otro acumulador se traducen a los de este
+        remap = [self._user_id(username) for username in other.usernames]
+        for day, other_counts in other.date_user_counts.items():
+            user_counts = self.date_user_counts[day]
+            for other_id, count in other_counts.items():
+                user_id = remap[other_id]
+                user_counts[user_id] = user_counts.get(user_id, 0) + count
+
+    def result(self) -> List[Tuple[date, str]]:
+        # Obtener top n fechas con más tweets (ante empates, la primera en aparecer)
+        totals = {day: sum(user_counts.values()) for day, user_counts in self.date_user_counts.items()}
+        top_days = heapq.nlargest(self.n, totals, key=totals.get)
+
+        # Usuario más activo por cada fecha top; ante empates gana el primero
+        # en aparecer, como `most_common(1)`
+        top_users = []
+        for day in top_days:
+            user_counts = self.date_user_counts[day]
+            user_id = max(user_counts, key=user_counts.get)
+            top_users.append((date.fromisoformat(day), self.usernames[user_id]))
+        return top_users
+
+    def _local_day(self, timestamp: str) -> str:
+        """Fecha `YYYY-MM-DD` en la zona `tz` de un instante ISO 8601. Un
+        instante sin desplazamiento se interpreta como UTC.
+        """
+        moment = datetime.fromisoformat(timestamp)
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return moment.astimezone(self.tz).date().isoformat()
+
+    def _user_id(self, username: str) -> int:
+        user_id = self.user_ids.get(username)
+        if user_id is None:
+            user_id = self.user_ids[username] = len(self.usernames)
+            self.usernames.append(username)
+        return user_id
+
+
+class TopEmojisAccumulator(Accumulator):
+    """Q2: top n emojis más usados en `renderedContent` (10 por defecto)."""
+
+    def __init__(self, max_counters: Optional[int] = None, n: int = 10):
+        # Con `max_counters` el conteo es aproximado y con memoria fija
+        self.emoji_counter = new_counter(max_counters)
+        self.n = n
+
+    def update(self, tweet: dict) -> None:
+        content = tweet['renderedContent']
+        emojis = extract_emojis(content)
+        self.emoji_counter.update(emojis)
+
+    def merge(self, other: 'TopEmojisAccumulator') -> None:
+        self.emoji_counter.update(other.emoji_counter)
+
+    def result(self) -> List[Tuple[str, int]]:
+        report_approximation('emojis', self.emoji_counter, self.n)
+        return self.emoji_counter.most_common(self.n)
+
+
+class TopMentionsAccumulator(Accumulator):
+    """Q3: top n usuarios más mencionados (10 por defecto)."""
+
+    def __init__(self, max_counters: Optional[int] = None, n: int = 10):
+        # Con `max_counters` el conteo es aproximado y con memoria fija
+        self.username_counter = new_counter(max_counters)
+        self.n = n
+
+    def update(self, tweet: dict) -> None:
+        mentioned_users = tweet.get('mentionedUsers')  # Devuelve None si la clave no existe
+
+        if not mentioned_users:  # Captura None y listas vacías
+            return
+
+        try:
+            usernames = [mention['username'] for mention in mentioned_users]
+            self.username_counter.update(usernames)
+        except (TypeError, KeyError):
+            # TypeError: Si algún mention no es diccionario
+            # KeyError: Si algún mention no tiene 'username'
+            return
+
+    def merge(self, other: 'TopMentionsAccumulator') -> None:
+        self.username_counter.update(other.username_counter)
+
+    def result(self) -> List[Tuple[str, int]]:
+        report_approximation('menciones', self.username_counter, self.n)
+        return self.username_counter.most_common(self.n)
+
+
+def report_approximation(name: str, counter, n: int) -> None:
+    """Imprime las cotas de error cuando el conteo es aproximado.
+
+    Parameters:
+        name (str): Nombre de lo que se cuenta
+        counter (Counter | SpaceSaving): Contador del acumulador
+        n (int): Tamaño del ranking devuelto
+    """
+    if not isinstance(counter, SpaceSaving):
+        return
+    guaranteed = 'sí' if counter.is_exact_top(n) else 'no'
+    print(
+        f"[yellow]Conteo aproximado de {name}[/yellow]: {counter.capacity:,} contadores, "
+        f"{counter.total:,} ocurrencias, error máximo por cuenta {counter.error_bound():,} "
+        f"(<= {counter.total / counter.capacity:,.1f}), top {n} garantizado: {guaranteed}"
+    )
+
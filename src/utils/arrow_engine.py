@@ -0,0 +1,318 @@
+# imports nativos
+from typing import Dict, Generator, List, Optional, Tuple
+from collections import Counter
+from datetime import date
+import os
+
+# imports externas
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import json as pa_json
+from rich import print
+import ujson
+
+# imports propios
+from .tracing import span
+from .readers import read_line_blocks, expand_paths, describe_paths, FilePaths
+from .extract_emoji import extract_emojis, non_emoji_run_regex
+from .filters import TweetFilter
+
+
+# Bytes de NDJSON que se parsean juntos en cada lote. El lector de Arrow
+# divide cada lote en bloques de `PARSE_BLOCK_SIZE` y los parsea en paralelo
+BATCH_SIZE = 16 * 1024 * 1024
+PARSE_BLOCK_SIZE = 1024 * 1024
+
+# Lotes parciales de q1 que se guardan antes de reagruparlos en uno solo
+COMPACT_EVERY = 16
+
+# Columnas que necesita `filter_batch`
+FILTER_COLUMNS = {
+    'date': pa.string(),
+    'user': pa.struct([('username', pa.string())]),
+}
+
+
+class BatchAccumulator:
+    """Interfaz de una pregunta respondida por lotes columnares: recibe cada
+    lote de Arrow (solo con las columnas de `columns`) y actualiza su estado
+    con kernels de `pyarrow.compute`, sin iterar fila por fila en Python.
+
+    Parameters:
+        n (int): Tamaño del ranking del resultado
+    """
+
+    columns: Dict[str, pa.DataType] = {}
+
+    def __init__(self, n: int = 10):
+        self.n = n
+
+    def update(self, batch: pa.Table) -> None:
+        raise NotImplementedError
+
+    def result(self) -> list:
+        raise NotImplementedError
+
+
+class TopDatesUserBatchAccumulator(BatchAccumulator):
+    """Q1: top n fechas con más tweets y el usuario más activo en cada una.
+
+    Cada lote se agrupa por (fecha, usuario) y las cuentas parciales se
+    reagrupan cada `COMPACT_EVERY` lotes. `group_by` no conserva el orden
+    de aparición, así que cada grupo guarda además la primera fila en la que
+    aparece (`first`, el mínimo de un contador de filas que corre entre
+    lotes). Fechas y usuarios se ordenan por cantidad descendente y luego
+    por `first`: los empates se resuelven igual que en la variante de
+    memoria, a favor del primero en aparecer.
+
+    Como en la variante de memoria, un `user.username` nulo se cuenta como
+    un usuario más (`None`) y un tweet sin `date` o sin `user` hace fallar
+    la pregunta; ninguna fila se descarta en silencio.
+    """
+
+    columns = {
+        'date': pa.string(),
+        'user': pa.struct([('username', pa.string())]),
+    }
+
+    COUNTS_SCHEMA = pa.schema([
+        ('day', pa.string()),
+        ('username', pa.string()),
+        ('count', pa.int64()),
+        ('first', pa.int64()),
+    ])
+
+    def __init__(self, n: int = 10):
+        super().__init__(n)
+        self.partials: List[pa.Table] = []
+        self.rows = 0  # Filas vistas en los lotes anteriores
+
+    def update(self, batch: pa.Table) -> None:
+        # `tweet['date'][:10]` y `tweet['user']['username']` fallan en la variante de memoria
+        if batch['date'].null_count or batch['user'].null_count:
+            raise ValueError('Hay tweets sin date o sin user')
+        pairs = pa.table({
+            'day': pc.utf8_slice_codeunits(batch['date'], 0, 10),  # Fecha local, sin parsear
+            'username': pc.struct_field(batch['user'], 'username'),
+            'row': pa.array(range(self.rows, self.rows + batch.num_rows), pa.int64()),
+        })
+        self.rows += batch.num_rows
+        counts = pairs.group_by(['day', 'username'], use_threads=False).aggregate([
+            ([], 'count_all'),
+            ('row', 'min'),
+        ])
+        self.partials.append(counts.rename_columns(self.COUNTS_SCHEMA.names))
+        if len(self.partials) >= COMPACT_EVERY:
+            self.partials = [self._counts()]
+
+    def result(self) -> List[Tuple[date, str]]:
+        counts = self._counts()
+        totals = counts.group_by('day', use_threads=False).aggregate([('count', 'sum'), ('first', 'min')])
+        top_days = totals.take(
+            pc.sort_indices(totals, [('count_sum', 'descending'), ('first_min', 'ascending')])[:self.n]
+        )
+
+        top_users = []
+        for day in top_days['day'].to_pylist():
+            day_counts = counts.filter(pc.equal(counts['day'], day))
+            top = pc.sort_indices(day_counts, [('count', 'descending'), ('first', 'ascending')])[0]
+            top_users.append((date.fromisoformat(day), day_counts['username'][top.as_py()].as_py()))
+        return top_users
+
+    def _counts(self) -> pa.Table:
+        if not self.partials:
+            return self.COUNTS_SCHEMA.empty_table()
+        counts = pa.concat_tables(self.partials)
+        if len(self.partials) == 1:
+            return counts
+        counts = counts.group_by(['day', 'username'], use_threads=False).aggregate([
+            ('count', 'sum'),
+            ('first', 'min'),
+        ])
+        return counts.rename_columns(self.COUNTS_SCHEMA.names)
+
+
+class TopEmojisBatchAccumulator(BatchAccumulator):
+    """Q2: top n emojis más usados en `renderedContent`.
+
+    Los textos se cortan con un kernel de expresiones regulares por los
+    tramos sin caracteres de emoji (ver `non_emoji_run_regex`) y los
+    fragmentos se cuentan con `value_counts`. Solo los fragmentos distintos
+    (unos pocos miles) pasan por `extract_emojis`, con su cantidad.
+    """
+
+    columns = {'renderedContent': pa.string()}
+
+    def __init__(self, n: int = 10):
+        super().__init__(n)
+        self.emoji_counter = Counter()
+        self.pattern = non_emoji_run_regex()
+
+    def update(self, batch: pa.Table) -> None:
+        fragments = pc.list_flatten(pc.split_pattern_regex(batch['renderedContent'], pattern=self.pattern))
+        fragment_counts = pc.value_counts(fragments)
+        for fragment, count in zip(
+            fragment_counts.field('values').to_pylist(),
+            fragment_counts.field('counts').to_pylist()
+        ):
+            if fragment:
+                for emoji in extract_emojis(fragment):
+                    self.emoji_counter[emoji] += count
+
+    def result(self) -> List[Tuple[str, int]]:
+        return self.emoji_counter.most_common(self.n)
+
+
+class TopMentionsBatchAccumulator(BatchAccumulator):
+    """Q3: top n usuarios más mencionados, aplanando `mentionedUsers`."""
+
+    columns = {'mentionedUsers': pa.list_(pa.struct([('username', pa.string())]))}
+
+    def __init__(self, n: int = 10):
+        super().__init__(n)
+        self.username_counter = Counter()
+
+    def update(self, batch: pa.Table) -> None:
+        mentions = pc.list_flatten(batch['mentionedUsers'])
+        usernames = pc.struct_field(mentions, 'username').drop_null()
+        username_counts = pc.value_counts(usernames)
+        self.username_counter.update(dict(zip(
+            username_counts.field('values').to_pylist(),
+            username_counts.field('counts').to_pylist()
+        )))
+
+    def result(self) -> List[Tuple[str, int]]:
+        return self.username_counter.most_common(self.n)
+
+
+def run_batches(
+    file_path: FilePaths,
+    accumulators: List[BatchAccumulator],
+    batch_size: int = BATCH_SIZE,
+    tweet_filter: Optional[TweetFilter] = None
+) -> List[list]:
+    """Lee el NDJSON en lotes columnares de Arrow, proyectando solo las
+    columnas que declaran los acumuladores, y pasa cada lote a todos ellos.
+    La memoria queda acotada por el tamaño del lote y por el estado
+    agregado, no por el tamaño del archivo. Con varios archivos (lista,
+    patrón glob o carpeta) los lotes se leen archivo por archivo, en orden.
+    Con `tweet_filter` cada lote se filtra con kernels de Arrow antes de
+    pasarlo a los acumuladores (ver `filter_batch`). Un acumulador que falla
+    se descarta sin interrumpir a los demás, como en el escaneo en streaming.
+
+    Parameters:
+        file_path (FilePaths): Ruta al archivo NDJSON (plano o comprimido), lista de
+            rutas, patrón glob o carpeta
+        accumulators (List[BatchAccumulator]): Acumuladores a alimentar
+        batch_size (int): Bytes de NDJSON por lote
+        tweet_filter (Optional[TweetFilter]): Filtro de fechas y autores, None para todos los tweets
+    Returns:
+        (List[list]): Resultado de cada acumulador, en el mismo orden
+    """
+    results = [[] for _ in accumulators]
+    columns = {}
+    for accumulator in accumulators:
+        columns.update(accumulator.columns)
+    if tweet_filter is not None:
+        columns.update(FILTER_COLUMNS)
+    schema = pa.schema(list(columns.items()))
+
+    with span('run_batches', file=describe_paths(file_path)) as run:
+        try:
+            # Etapa 1: Lectura y agregación por lotes
+            with span('read') as read:
+                paths = expand_paths(file_path)
+                run.attributes['files'] = len(paths)
+                read.rows = 0
+                failed = set()
+                for path in paths:
+                    for batch in read_batches(path, schema, batch_size):
+                        if tweet_filter is not None:
+                            batch = filter_batch(batch, tweet_filter)
+                        read.rows += batch.num_rows
+                        for index, accumulator in enumerate(accumulators):
+                            if index in failed:
+                                continue
+                            try:
+                                accumulator.update(batch)
+                            except Exception as e:
+                                print(f"Error al procesar el archivo: {e}")
+                                failed.add(index)
+                read.bytes = sum(os.path.getsize(path) for path in paths)
+
+            # Etapa 2: Procesamiento de resultados
+            with span('query'):
+                results = [
+                    [] if index in failed else accumulator.result()
+                    for index, accumulator in enumerate(accumulators)
+                ]
+            run.rows, run.bytes = read.rows, read.bytes
+
+        except Exception as e:
+            print(f"Error al procesar el archivo: {e}")
+            results = [[] for _ in accumulators]
+
+    return results
+
+
+def filter_batch(batch: pa.Table, tweet_filter: TweetFilter) -> pa.Table:
+    """Deja en el lote solo los tweets que pasan el filtro, comparando el
+    prefijo `YYYY-MM-DD` de `date` y el autor con kernels vectorizados.
+
+    Parameters:
+        batch (pa.Table): Lote con las columnas de `FILTER_COLUMNS`
+        tweet_filter (TweetFilter): Filtro de fechas y autores
+    Returns:
+        pa.Table: Lote filtrado
+    """
+    day = pc.utf8_slice_codeunits(batch['date'], 0, 10)
+    mask = pc.is_valid(day)
+    if tweet_filter.start is not None:
+        mask = pc.and_kleene(mask, pc.greater_equal(day, tweet_filter.start))
+    if tweet_filter.end is not None:
+        mask = pc.and_kleene(mask, pc.less_equal(day, tweet_filter.end))
+    if tweet_filter.users is not None:
+        usernames = pc.struct_field(batch['user'], 'username')
+        mask = pc.and_kleene(mask, pc.is_in(usernames, value_set=pa.array(sorted(tweet_filter.users), pa.string())))
+    return batch.filter(mask)
+
+
+def read_batches(
+    file_path: str,
+    schema: pa.Schema,
+    batch_size: int = BATCH_SIZE
+) -> Generator[pa.Table, None, None]:
+    """Generador de lotes de tweets como tablas de Arrow con el esquema
+    explícito (el resto de los campos se ignora). Arrow no puede saltear
+    líneas inválidas: si un lote falla, se descartan las líneas que no son
+    JSON válido y se vuelve a parsear, como hacen las variantes de memoria.
+
+    Parameters:
+        file_path (str): Ruta al archivo NDJSON
+        schema (pa.Schema): Columnas a leer
+        batch_size (int): Bytes de NDJSON por lote
+    Yields:
+        pa.Table: Lote de tweets
+    """
+    parse_options = pa_json.ParseOptions(explicit_schema=schema, unexpected_field_behavior='ignore')
+    read_options = pa_json.ReadOptions(block_size=PARSE_BLOCK_SIZE)
+
+    for block in read_line_blocks(file_path, batch_size):
+        try:
+            yield pa_json.read_json(pa.BufferReader(block), read_options, parse_options)
+        except pa.ArrowInvalid:
+            block = _valid_lines(block)
+            if block:
+                yield pa_json.read_json(pa.BufferReader(block), read_options, parse_options)
+
+
+def _valid_lines(block: bytes) -> bytes:
+    """Deja solo las líneas del bloque que son un objeto JSON válido."""
+    valid = []
+    for line in block.split(b'\n'):
+        try:
+            if isinstance(ujson.loads(line), dict):
+                valid.append(line)
+        except (ValueError, ujson.JSONDecodeError):
+            continue
+    return b''.join(line + b'\n' for line in valid)
@@ -0,0 +1,158 @@
+# imports nativos
+from typing import Any, Optional, Tuple
+import glob
+import hashlib
+import os
+import pickle
+
+
+# Bytes del inicio y del final del archivo que entran en la huella
+FINGERPRINT_SAMPLE_BYTES = 1024 * 1024
+
+
+def file_fingerprint(file_path: str) -> str:
+    """Calcula una huella barata del archivo fuente: ruta absoluta, tamaño,
+    fecha de modificación y un hash del primer y último MB. Cambia cuando el
+    archivo se reescribe, se trunca o se le agregan líneas, sin tener que
+    leer los cientos de MB completos.
+
+    Parameters:
+        file_path (str): Ruta al archivo NDJSON
+    Returns:
+        str: Huella hexadecimal del archivo
+    """
+    stat = os.stat(file_path)
+    digest = hashlib.sha1()
+    digest.update(os.path.abspath(file_path).encode('utf-8'))
+    digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8'))
+
+    with open(file_path, 'rb') as f:
+        digest.update(f.read(FINGERPRINT_SAMPLE_BYTES))
+        if stat.st_size > FINGERPRINT_SAMPLE_BYTES:
+            f.seek(max(stat.st_size - FINGERPRINT_SAMPLE_BYTES, FINGERPRINT_SAMPLE_BYTES))
+            digest.update(f.read())
+
+    return digest.hexdigest()
+
+
+def cache_path(file_path: str, cache_dir: str, suffix: str = '.parquet', schema: str = '') -> str:
+    """Ruta del archivo de caché para la versión actual del archivo fuente.
+    El nombre combina un hash de la ruta (para poder encontrar versiones
+    viejas del mismo archivo) con la huella de su contenido y del esquema
+    guardado, de modo que cambiar las columnas también invalida la caché.
+
+    Parameters:
+        file_path (str): Ruta al archivo NDJSON
+        cache_dir (str): Carpeta donde se guardan las cachés
+        suffix (str): Extensión del archivo de caché
+        schema (str): Descripción del esquema guardado en la caché
+    Returns:
+        str: Ruta del archivo de caché
+    """
+    schema_key = hashlib.sha1(schema.encode('utf-8')).hexdigest()[:8]
+    return os.path.join(
+        cache_dir,
+        f"{_source_key(file_path)}-{file_fingerprint(file_path)}-{schema_key}{suffix}"
+    )
+
+
+def invalidate_cache(file_path: str, cache_dir: str, keep: Optional[str] = None, suffix: str = '.parquet') -> None:
+    """Elimina las cachés de versiones anteriores del archivo fuente.
+
+    Parameters:
+        file_path (str): Ruta al archivo NDJSON
+        cache_dir (str): Carpeta donde se guardan las cachés
+        keep (Optional[str]): Caché vigente que no debe borrarse
+        suffix (str): Extensión del archivo de caché
+    """
+    for stale in glob.glob(os.path.join(cache_dir, f"{_source_key(file_path)}-*{suffix}")):
+        if stale != keep:
+            os.remove(stale)
+
+
+def prefix_fingerprint(file_path: str, offset: int) -> str:
+    """Huella de los primeros `offset` bytes del archivo: su longitud y un
+    hash del primer y último MB de esa porción. Si el archivo solo creció
+    agregando líneas al final, la huella del prefijo ya procesado no cambia;
+    si se truncó o se reescribió, sí.
+
+    Parameters:
+        file_path (str): Ruta al archivo NDJSON
+        offset (int): Cantidad de bytes del prefijo
+    Returns:
+        str: Huella hexadecimal del prefijo
+    """
+    digest = hashlib.sha1(str(offset).encode('utf-8'))
+    with open(file_path, 'rb') as f:
+        digest.update(f.read(min(offset, FINGERPRINT_SAMPLE_BYTES)))
+        if offset > FINGERPRINT_SAMPLE_BYTES:
+            tail = max(offset - FINGERPRINT_SAMPLE_BYTES, FINGERPRINT_SAMPLE_BYTES)
+            f.seek(tail)
+            digest.update(f.read(offset - tail))
+    return digest.hexdigest()
+
+
+def checkpoint_path(file_path: str, checkpoint_dir: str, schema: str = '') -> str:
+    """Ruta del checkpoint de un archivo fuente. A diferencia de
+    `cache_path`, no depende del contenido: el mismo checkpoint se reutiliza
+    mientras el archivo crece.
+
+    Parameters:
+        file_path (str): Ruta al archivo NDJSON
+        checkpoint_dir (str): Carpeta donde se guardan los checkpoints
+        schema (str): Descripción de lo que se guarda (por ejemplo, qué acumuladores)
+    Returns:
+        str: Ruta del archivo de checkpoint
+    """
+    schema_key = hashlib.sha1(schema.encode('utf-8')).hexdigest()[:8]
+    return os.path.join(checkpoint_dir, f"{_source_key(file_path)}-{schema_key}.ckpt")
+
+
+def load_checkpoint(file_path: str, path: str) -> Optional[Tuple[Any, int]]:
+    """Lee un checkpoint y verifica que siga correspondiendo al archivo.
+
+    Parameters:
+        file_path (str): Ruta al archivo NDJSON
+        path (str): Ruta del checkpoint (ver `checkpoint_path`)
+    Returns:
+        (Optional[Tuple[Any, int]]): (estado guardado, byte hasta el que se
+        procesó), o None si no hay checkpoint o el archivo se truncó o reescribió
+    """
+    if not os.path.exists(path):
+        return None
+
+    with open(path, 'rb') as f:
+        checkpoint = pickle.load(f)
+
+    offset = checkpoint['offset']
+    if os.path.getsize(file_path) < offset:  # Truncado
+        return None
+    if prefix_fingerprint(file_path, offset) != checkpoint['fingerprint']:  # Reescrito
+        return None
+    return checkpoint['state'], offset
+
+
+def save_checkpoint(file_path: str, path: str, state: Any, offset: int) -> None:
+    """Guarda el estado agregado de los primeros `offset` bytes del archivo.
+
+    Parameters:
+        file_path (str): Ruta al archivo NDJSON
+        path (str): Ruta del checkpoint (ver `checkpoint_path`)
+        state (Any): Estado a guardar, debe poder serializarse con pickle
+        offset (int): Byte hasta el que se procesó el archivo
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    checkpoint = {
+        'offset': offset,
+        'fingerprint': prefix_fingerprint(file_path, offset),
+        'state': state,
+    }
+    # Escribo a un temporal y renombro para no dejar checkpoints a medio escribir
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def _source_key(file_path: str) -> str:
+    return hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()[:16]
@@ -0,0 +1,70 @@
+# imports nativos
+from typing import BinaryIO, Generator, Optional
+import bz2
+import gzip
+
+# imports propios
+from .prefetch import prefetch_blocks
+
+
+# Extensiones de archivos comprimidos soportadas y su algoritmo
+COMPRESSIONS = {
+    '.gz': 'gzip',
+    '.bz2': 'bz2',
+    '.zst': 'zstd',
+}
+
+
+def compression_of(file_path: str) -> Optional[str]:
+    """Algoritmo de compresión del archivo según su extensión.
+
+    Parameters:
+        file_path (str): Ruta al archivo
+    Returns:
+        (Optional[str]): 'gzip', 'bz2', 'zstd' o None si no está comprimido
+    """
+    for suffix, compression in COMPRESSIONS.items():
+        if file_path.endswith(suffix):
+            return compression
+    return None
+
+
+def open_decompressed(file_path: str) -> BinaryIO:
+    """Abre un archivo comprimido como flujo binario descomprimido.
+
+    gzip y bz2 usan la librería estándar; zstd usa el códec de pyarrow (ya
+    es dependencia de las variantes de tiempo), que se importa solo si hace
+    falta. Los tres liberan el GIL mientras descomprimen.
+
+    Parameters:
+        file_path (str): Ruta al archivo comprimido
+    Returns:
+        BinaryIO: Flujo con el contenido descomprimido
+    """
+    compression = compression_of(file_path)
+    if compression == 'gzip':
+        return gzip.open(file_path, 'rb')
+    if compression == 'bz2':
+        return bz2.open(file_path, 'rb')
+    if compression == 'zstd':
+        import pyarrow as pa
+        return pa.input_stream(file_path, compression='zstd')
+    raise ValueError(f"El archivo no está comprimido: {file_path}")
+
+
+def read_compressed_lines(file_path: str) -> Generator[bytes, None, None]:
+    """Generador de líneas (sin decodificar) de un archivo comprimido,
+    descomprimido en segundo plano con `prefetch_blocks`.
+
+    Parameters:
+        file_path (str): Ruta al archivo comprimido
+    Yields:
+        bytes: Línea del archivo, sin el salto de línea
+    """
+    rest = b''
+    for block in prefetch_blocks(open_decompressed(file_path)):
+        lines = (rest + block).split(b'\n')
+        rest = lines.pop()
+        yield from lines
+    if rest:
+        yield rest
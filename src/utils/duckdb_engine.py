@@ -0,0 +1,604 @@
+# imports nativos
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+from datetime import date
+import functools
+import os
+import tempfile
+
+# imports externas
+import duckdb
+import pyarrow as pa
+from pyarrow import json as pa_json
+from rich import print
+
+# imports propios
+from .tracing import span
+from .extract_emoji import extract_emojis, emoji_regex, TOKENIZER_ONLY_PATTERN
+from .cache import cache_path, invalidate_cache
+from .compression import compression_of
+from .readers import expand_paths, describe_paths, FilePaths
+from .filters import TweetFilter
+
+if TYPE_CHECKING:
+    from .duckdb_session import SessionManager
+
+
+def query_top_dates_user(
+    conn: duckdb.DuckDBPyConnection,
+    n: int = 10,
+    tweet_filter: Optional[TweetFilter] = None
+) -> List[Tuple[date, str]]:
+    """Q1: top n fechas con más tweets y el usuario más activo en cada una.
+
+    Cada tweet se numera en el orden del escaneo (`row_number() over ()`,
+    que DuckDB calcula en streaming respetando el orden de inserción) y
+    cada fecha y cada (fecha, usuario) guardan su primera fila. Los empates
+    se resuelven a favor del primero en aparecer, igual que en las variantes
+    de memoria y Arrow. Con `preserve_insertion_order` desactivado (modo
+    fuera de memoria) el orden del escaneo no está garantizado y los
+    empates pueden resolverse distinto.
+
+    Parameters:
+        conn (duckdb.DuckDBPyConnection): Conexión con `farmers_protest_raw` cargada
+        n (int): Cantidad de fechas
+        tweet_filter (Optional[TweetFilter]): Filtro de fechas y autores (ver `filter_sql`)
+    Returns:
+        (List[Tuple[datetime.date, str]]): Lista de tuplas (fecha, usuario)
+    """
+    query = f"""
+        -- Tweets en el orden del archivo
+        with tweets as (
+            select
+                cast(fp.date as date) as date_day,
+                fp.user.username as username,
+                row_number() over () as row_number
+            from farmers_protest_raw as fp
+            where {filter_sql(tweet_filter, 'fp')}
+        ),
+
+        -- Tweets y primera aparición de cada usuario en cada fecha
+        user_counts as (
+            select
+                date_day,
+                username,
+                count(*) as user_count,
+                min(row_number) as first_seen
+            from tweets
+            group by date_day, username
+        ),
+
+        -- Obtener top n fechas con mayor interacción
+        top_dates as (
+            select
+                date_day,
+                sum(user_count) as count,
+                min(first_seen) as first_seen
+            from user_counts
+            group by date_day
+            order by count desc, first_seen
+            limit {int(n)}
+        ),
+
+        -- Usuario con mayor interacción por cada fecha top
+        top_users as (
+            select
+                uc.date_day,
+                uc.username,
+                td.count,
+                td.first_seen,
+                row_number() over (
+                    partition by uc.date_day
+                    order by uc.user_count desc, uc.first_seen
+                ) as rank
+            from user_counts as uc
+            join top_dates as td
+                on uc.date_day = td.date_day
+        )
+
+        -- Resultado final
+        select
+            date_day AS date,
+            username,
+        from top_users
+        where rank = 1
+        order by count desc, first_seen;
+    """
+    result = conn.execute(query).fetchall()
+    return [(row[0], row[1]) for row in result]
+
+
+def query_top_emojis(
+    conn: duckdb.DuckDBPyConnection,
+    n: int = 10,
+    tweet_filter: Optional[TweetFilter] = None
+) -> List[Tuple[str, int]]:
+    """Q2: top n emojis más usados en `renderedContent`.
+
+    Parameters:
+        conn (duckdb.DuckDBPyConnection): Conexión con `farmers_protest_raw` cargada
+        n (int): Cantidad de emojis
+        tweet_filter (Optional[TweetFilter]): Filtro de fechas y autores (ver `filter_sql`)
+    Returns:
+        (List[Tuple[str, int]]): Lista de tuplas (emoji, cantidad)
+    """
+    # Registrar la versión vectorizada (Arrow) de la función en DuckDB, una
+    # sola vez por conexión (las sesiones reutilizan la misma conexión)
+    registered = conn.execute(
+        "select 1 from duckdb_functions() where function_name = 'extract_emojis'"
+    ).fetchone()
+    if registered is None:
+        conn.create_function(
+            name='extract_emojis',
+            function=extract_emojis_arrow,
+            return_type='VARCHAR[]',
+            parameters=['VARCHAR'],
+            type='arrow'
+        )
+
+    # La mayoría de los textos se resuelve con la expresión regular nativa
+    # de DuckDB; solo los que contienen ZWJ o caracteres de etiqueta pasan
+    # por el tokenizador de `emoji`, para obtener exactamente su resultado
+    query = f"""
+        with emoji_data as (
+            select
+                case
+                    when regexp_matches(renderedContent, $tokenizer_only)
+                        then extract_emojis(renderedContent)
+                    else regexp_extract_all(renderedContent, $emoji_pattern)
+                end as emojis
+            from farmers_protest_raw
+            where content is not null and {filter_sql(tweet_filter, 'farmers_protest_raw')}
+        ),
+        unnested AS (
+            select unnest(emojis) as emoji_char
+            from emoji_data
+            where array_length(emojis) > 0
+        )
+        select
+            emoji_char,
+            count(*) as count
+        from unnested
+        group by emoji_char
+        order by count desc
+        limit {int(n)}
+    """
+    result = conn.execute(query, {
+        'tokenizer_only': TOKENIZER_ONLY_PATTERN,
+        'emoji_pattern': emoji_regex(),
+    }).fetchall()
+    return [(row[0], row[1]) for row in result]
+
+
+def extract_emojis_arrow(texts: pa.Array) -> pa.Array:
+    """Versión vectorizada de `extract_emojis` para registrarla en DuckDB
+    como UDF de tipo Arrow: recibe un vector completo de textos en lugar de
+    una llamada a Python por fila.
+
+    Parameters:
+        texts (pa.Array): Vector de textos
+    Returns:
+        (pa.Array): Vector con la lista de emojis de cada texto
+    """
+    return pa.array(
+        [None if text is None else extract_emojis(text) for text in texts.to_pylist()],
+        type=pa.list_(pa.string())
+    )
+
+
+def query_top_mentions(
+    conn: duckdb.DuckDBPyConnection,
+    n: int = 10,
+    tweet_filter: Optional[TweetFilter] = None
+) -> List[Tuple[str, int]]:
+    """Q3: top n usuarios más mencionados.
+
+    Parameters:
+        conn (duckdb.DuckDBPyConnection): Conexión con `farmers_protest_raw` cargada
+        n (int): Cantidad de usuarios
+        tweet_filter (Optional[TweetFilter]): Filtro de fechas y autores (ver `filter_sql`)
+    Returns:
+        (List[Tuple[str, int]]): Lista de tuplas (usuario, cantidad)
+    """
+    # Utilizo unnest + list_transform para poder "aplanar" la estructura
+    # y luego poder contar los usuarios mencionados y usar count y group by
+    query = f"""
+        with extracted_mentions AS (
+            select unnest(
+                list_transform(
+                    mentionedUsers, mentionedUser -> mentionedUser.username
+                )
+            ) as username
+            from farmers_protest_raw
+            where mentionedUsers is not null and {filter_sql(tweet_filter, 'farmers_protest_raw')}
+        )
+
+        select
+            username,
+            count(*) as count
+        from extracted_mentions
+        group by username
+        order by count DESC
+        limit {int(n)}
+
+    """
+    result = conn.execute(query).fetchall()
+    return [(row[0], row[1]) for row in result]
+
+
+# Esquema mínimo que lee cada consulta. `date` se lee como texto, igual que
+# lo infiere read_ndjson_auto, para que `cast(date as date)` tome la fecha
+# local del string (los 10 primeros caracteres) como en la variante de memoria
+QUERY_COLUMNS = {
+    query_top_dates_user: {
+        'date': 'VARCHAR',
+        'user': 'STRUCT(username VARCHAR)',
+    },
+    query_top_emojis: {
+        'content': 'VARCHAR',
+        'renderedContent': 'VARCHAR',
+    },
+    query_top_mentions: {
+        'mentionedUsers': 'STRUCT(username VARCHAR)[]',
+    },
+}
+
+# Unión de todos los esquemas: es lo que se guarda en la caché columnar
+SOURCE_COLUMNS = {
+    name: column_type
+    for columns in QUERY_COLUMNS.values()
+    for name, column_type in columns.items()
+}
+
+
+# Columnas que necesita `filter_sql`
+FILTER_COLUMNS = QUERY_COLUMNS[query_top_dates_user]
+
+
+def filter_sql(tweet_filter: Optional[TweetFilter], table: str) -> str:
+    """Condición SQL de un filtro de tweets, con los valores como literales
+    (una vista no admite parámetros preparados). La fecha es, como en q1,
+    `cast(date as date)`: la fecha local del texto.
+
+    Parameters:
+        tweet_filter (Optional[TweetFilter]): Filtro de fechas y autores, None para no filtrar
+        table (str): Nombre o alias de la tabla con las columnas `date` y `user`
+    Returns:
+        str: Condición para usar en un `where`
+    """
+    if tweet_filter is None:
+        return 'true'
+    conditions = []
+    if tweet_filter.start is not None:
+        conditions.append(f"cast({table}.date as date) >= date '{tweet_filter.start}'")
+    if tweet_filter.end is not None:
+        conditions.append(f"cast({table}.date as date) <= date '{tweet_filter.end}'")
+    if tweet_filter.users is not None:
+        users = ", ".join(_sql_string(username) for username in sorted(tweet_filter.users))
+        # `in (...)` se reescribe como un OR de igualdades, que devuelve las
+        # filas de cada vector desordenadas; `list_contains` conserva el orden
+        # del archivo, del que depende el desempate de q1
+        conditions.append(f"list_contains([{users}], {table}.user.username)" if users else 'false')
+    return ' and '.join(conditions) or 'true'
+
+
+def _sql_string(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def columns_for(queries: List[Callable]) -> Optional[Dict[str, str]]:
+    """Unión de los esquemas mínimos de las consultas pedidas.
+
+    Parameters:
+        queries (List[Callable]): Consultas a ejecutar
+    Returns:
+        (Optional[Dict[str, str]]): Columnas y tipos, o None si alguna consulta
+        no declara su esquema y necesita todas las columnas
+    """
+    columns = {}
+    for query in queries:
+        if query not in QUERY_COLUMNS:
+            return None
+        columns.update(QUERY_COLUMNS[query])
+    return columns
+
+
+def read_ndjson_sql(paths: List[str], columns: Optional[Dict[str, str]] = None) -> str:
+    """Expresión SQL que lee el NDJSON. Con `columns` se usa `read_ndjson`
+    con esquema explícito: DuckDB no infiere el esquema y solo construye las
+    columnas pedidas, ignorando el resto del tweet. Con varios archivos se
+    pasa la lista completa a una sola lectura, que DuckDB escanea en
+    paralelo como una única fuente.
+
+    Parameters:
+        paths (List[str]): Rutas a los archivos NDJSON
+        columns (Optional[Dict[str, str]]): Columnas y tipos, None para inferir todo
+    Returns:
+        str: Expresión para usar en un `from`
+    """
+    files = _sql_string(paths[0]) if len(paths) == 1 else "[" + ", ".join(map(_sql_string, paths)) + "]"
+    if columns is None:
+        return f"read_ndjson_auto({files})"
+
+    schema = ", ".join(f"\"{name}\": '{column_type}'" for name, column_type in columns.items())
+    return f"read_ndjson({files}, columns={{{schema}}})"
+
+
+def source_sql(
+    conn: duckdb.DuckDBPyConnection,
+    paths: List[str],
+    columns: Optional[Dict[str, str]] = None
+) -> str:
+    """Expresión SQL para leer los archivos, planos o comprimidos. DuckDB lee
+    directamente .gz y .zst (detecta la compresión por la extensión). Si hay
+    algún .bz2, que DuckDB no soporta, los archivos se leen con el lector
+    JSON de Arrow, que descomprime en hilos en segundo plano mientras
+    parsea, y la tabla resultante se registra en la conexión.
+
+    Parameters:
+        conn (duckdb.DuckDBPyConnection): Conexión de DuckDB
+        paths (List[str]): Rutas a los archivos NDJSON
+        columns (Optional[Dict[str, str]]): Columnas y tipos, None para inferir todo
+    Returns:
+        str: Expresión para usar en un `from`
+    """
+    if all(compression_of(path) != 'bz2' for path in paths):
+        return read_ndjson_sql(paths, columns)
+
+    schema = None
+    if columns is not None:
+        # Tipos de Arrow equivalentes a los de DuckDB, sin repetir el esquema
+        select = ", ".join(f"null::{column_type} as \"{name}\"" for name, column_type in columns.items())
+        schema = conn.execute(f"select {select} limit 0").arrow().schema
+
+    parse_options = pa_json.ParseOptions(
+        explicit_schema=schema,
+        unexpected_field_behavior='infer' if schema is None else 'ignore'
+    )
+    table = pa.concat_tables(
+        [
+            pa_json.read_json(pa.input_stream(path, compression=compression_of(path)), parse_options=parse_options)
+            for path in paths
+        ],
+        promote_options='default' if schema is None else 'none'
+    )
+    conn.register('farmers_protest_arrow', table)
+    return 'farmers_protest_arrow'
+
+
+def load_source(
+    conn: duckdb.DuckDBPyConnection,
+    file_path: FilePaths,
+    cache_dir: Optional[str] = None,
+    columns: Optional[Dict[str, str]] = None,
+    materialize: bool = True,
+    tweet_filter: Optional[TweetFilter] = None
+) -> None:
+    """Deja disponible `farmers_protest_raw` en la conexión.
+
+    Sin caché, lee el NDJSON (plano o comprimido, ver `source_sql`) con el
+    esquema `columns` (o inferido si es None). Con `materialize` se crea una tabla en memoria, conveniente
+    cuando varias consultas leen la misma fuente; sin él se crea una vista
+    y cada consulta agrega directamente sobre el escaneo del archivo, sin
+    materializar los tweets. Con `tweet_filter` la condición se aplica sobre
+    el escaneo del archivo, así que solo se materializan los tweets pedidos.
+
+    Con caché, busca para cada archivo un Parquet asociado a su huella
+    actual (ruta, tamaño, fecha de modificación y hash parcial); si no
+    existe lo genera con `SOURCE_COLUMNS` y borra las versiones anteriores.
+    Con varios archivos, al llegar un fragmento nuevo solo se convierte ese.
+
+    Parameters:
+        conn (duckdb.DuckDBPyConnection): Conexión de DuckDB
+        file_path (FilePaths): Ruta al archivo NDJSON, lista de rutas, patrón glob o carpeta
+        cache_dir (Optional[str]): Carpeta para la caché columnar, None para no usarla
+        columns (Optional[Dict[str, str]]): Esquema a leer, None para inferir todas las columnas
+        materialize (bool): Si es True crea una tabla, si no una vista sobre el archivo
+        tweet_filter (Optional[TweetFilter]): Filtro de fechas y autores, None para todos
+    """
+    paths = expand_paths(file_path)
+
+    if cache_dir is None:
+        relation = 'table' if materialize else 'view'
+        read_query = f"""
+            create {relation} farmers_protest_raw as
+            select * from {source_sql(conn, paths, columns)} as source
+            where {filter_sql(tweet_filter, 'source')}
+        """
+        conn.execute(read_query)
+        return
+
+    os.makedirs(cache_dir, exist_ok=True)
+    parquet_paths = ", ".join(_sql_string(cached_parquet(conn, path, cache_dir)) for path in paths)
+    conn.execute(f"""
+        create view farmers_protest_raw as
+        select * from read_parquet([{parquet_paths}])
+    """)
+
+
+def cached_parquet(conn: duckdb.DuckDBPyConnection, file_path: str, cache_dir: str) -> str:
+    """Ruta de la caché Parquet de un archivo, generándola si no existe.
+
+    Parameters:
+        conn (duckdb.DuckDBPyConnection): Conexión de DuckDB
+        file_path (str): Ruta al archivo NDJSON
+        cache_dir (str): Carpeta para la caché columnar
+    Returns:
+        str: Ruta del Parquet vigente
+    """
+    parquet_path = cache_path(file_path, cache_dir, schema=repr(SOURCE_COLUMNS))
+
+    if not os.path.exists(parquet_path):
+        # Escribo a un temporal y renombro para no dejar cachés a medio escribir
+        tmp_path = f"{parquet_path}.tmp"
+        conn.execute(f"""
+            copy (
+                select * from {source_sql(conn, [file_path], SOURCE_COLUMNS)}
+            ) to {_sql_string(tmp_path)} (format parquet)
+        """)
+        os.replace(tmp_path, parquet_path)
+        invalidate_cache(file_path, cache_dir, keep=parquet_path)
+
+    return parquet_path
+
+
+def connect_out_of_core(directory: str, memory_limit: str) -> duckdb.DuckDBPyConnection:
+    """Abre una base de DuckDB respaldada en disco dentro de `directory`,
+    con `memory_limit` como presupuesto de RAM y la misma carpeta como
+    `temp_directory` para volcar los agregados, joins y ventanas que no
+    entran. Sin conservar el orden de inserción, DuckDB puede agregar en
+    streaming sin bufferizar filas; las consultas ordenan sus resultados.
+
+    Parameters:
+        directory (str): Carpeta para la base y los archivos temporales
+        memory_limit (str): Memoria máxima de DuckDB (por ejemplo '2GB')
+    Returns:
+        duckdb.DuckDBPyConnection: Conexión configurada
+    """
+    return duckdb.connect(
+        database=os.path.join(directory, 'tweets.duckdb'),
+        config={
+            'memory_limit': memory_limit,
+            'temp_directory': directory,
+            'preserve_insertion_order': False,
+        }
+    )
+
+
+def count_rows(conn: duckdb.DuckDBPyConnection) -> int:
+    """Cantidad de tweets cargados en `farmers_protest_raw`."""
+    return conn.execute("select count(*) from farmers_protest_raw").fetchone()[0]
+
+
+def run_queries(
+    file_path: FilePaths,
+    queries: List[Callable[[duckdb.DuckDBPyConnection], list]],
+    cache_dir: Optional[str] = None,
+    sessions: Optional['SessionManager'] = None,
+    memory_limit: Optional[str] = None,
+    temp_dir: Optional[str] = None,
+    n: int = 10,
+    tweet_filter: Optional[TweetFilter] = None
+) -> List[list]:
+    """Carga el archivo NDJSON una sola vez en DuckDB y ejecuta todas las
+    consultas registradas sobre la misma tabla `farmers_protest_raw`.
+
+    Solo se leen las columnas que declaran las consultas en `QUERY_COLUMNS`.
+    Con `cache_dir` la primera ejecución convierte el archivo a Parquet con
+    esas columnas, y las siguientes leen esa caché en lugar de volver a
+    parsear el NDJSON (ver `load_source`).
+
+    Con `sessions` la conexión no se cierra al terminar: la primera llamada
+    carga el archivo en una sesión caliente y las siguientes consultan esa
+    misma tabla sin volver a leerlo (ver `utils.duckdb_session`). La
+    memoria de una sesión se configura en el `SessionManager`: `temp_dir` o
+    un `memory_limit` distinto del de las sesiones se rechazan.
+
+    Con `memory_limit` la consulta corre fuera de memoria (ver
+    `connect_out_of_core`): DuckDB respeta ese límite y vuelca a disco los
+    resultados intermedios que no entran.
+
+    Con una lista de rutas, un patrón glob o una carpeta, todos los archivos
+    se leen como una sola fuente con el escaneo multiarchivo de DuckDB.
+
+    Cada consulta recibe `n` y `tweet_filter`, que agrega al `where`. Sin
+    caché ni sesiones el filtro se aplica además al crear la tabla o la
+    vista, sobre el escaneo del archivo (ver `load_source`).
+
+    Parameters:
+        file_path (FilePaths): Ruta al archivo NDJSON, lista de rutas, patrón glob o carpeta
+        queries (List[Callable]): Consultas a ejecutar sobre la conexión
+        cache_dir (Optional[str]): Carpeta para la caché columnar, None para no usarla
+        sessions (Optional[SessionManager]): Sesiones calientes a reutilizar, None para
+            abrir y cerrar una conexión en cada llamada
+        memory_limit (Optional[str]): Memoria máxima de DuckDB (por ejemplo '2GB'), None
+            para la base en memoria sin límite explícito
+        temp_dir (Optional[str]): Carpeta bajo la que se crea la base temporal del modo
+            fuera de memoria, None para la carpeta temporal del sistema
+        n (int): Tamaño del ranking de cada consulta
+        tweet_filter (Optional[TweetFilter]): Filtro de fechas y autores, None para todos los tweets
+    Returns:
+        (List[list]): Resultado de cada consulta, en el mismo orden
+    Raises:
+        ValueError: Si con `sessions` se indica `temp_dir` o un `memory_limit` distinto del de las sesiones
+    """
+    if sessions is not None and (temp_dir is not None or memory_limit not in (None, sessions.memory_limit)):
+        # La sesión ya tiene su conexión: estos parámetros no tendrían efecto
+        raise ValueError(
+            'Con sessions, memory_limit se configura en el SessionManager '
+            f"({sessions.memory_limit}) y temp_dir no se admite"
+        )
+
+    results = [[] for _ in queries]
+    conn = None
+    spill_dir = None
+
+    with span('run_queries', file=describe_paths(file_path), memory_limit=memory_limit) as run:
+        try:
+            paths = expand_paths(file_path)
+            run.attributes['files'] = len(paths)
+            size = sum(os.path.getsize(path) for path in paths)
+
+            if sessions is None:
+                # Etapa 1: Conexión
+                with span('connection'):
+                    if memory_limit is None:
+                        conn = duckdb.connect(database=':memory:')
+                    else:
+                        spill_dir = tempfile.TemporaryDirectory(prefix='duckdb-', dir=temp_dir)
+                        conn = connect_out_of_core(spill_dir.name, memory_limit)
+
+                # Etapa 2: Lectura del archivo
+                # Con una sola consulta no hace falta materializar: se agrega
+                # directamente sobre el escaneo del archivo. Fuera de memoria la
+                # tabla vive en la base en disco y DuckDB la pagina con el límite
+                materialize = len(queries) > 1
+                columns = columns_for(queries)
+                if columns is not None and tweet_filter is not None:
+                    columns = {**columns, **FILTER_COLUMNS}
+                with span('read') as read:
+                    load_source(
+                        conn,
+                        paths,
+                        cache_dir,
+                        columns=columns,
+                        materialize=materialize,
+                        tweet_filter=tweet_filter
+                    )
+                    # Sobre una vista el archivo se lee recién al consultar
+                    loaded = materialize and cache_dir is None
+                    if loaded:
+                        read.rows, read.bytes = count_rows(conn), size
+                run_query = lambda query: query(conn, n, tweet_filter)
+            else:
+                # Etapas 1 y 2: sesión caliente (solo lee el archivo la primera vez)
+                with span('read') as read:
+                    session = sessions.get(file_path, cache_dir)
+                    read.rows = session.rows
+                run_query = lambda query: session.query(functools.partial(query, n=n, tweet_filter=tweet_filter))
+                loaded = True
+
+            # Etapa 3: Análisis y consulta, cada una como una fase anidada
+            with span('query') as query_span:
+                if not loaded and cache_dir is None:
+                    query_span.bytes = size
+                # Cada consulta falla de forma aislada, como si se ejecutara sola
+                for index, query in enumerate(queries):
+                    with span(query.__name__):
+                        try:
+                            results[index] = run_query(query)
+                        except Exception as e:
+                            print(f"Error al procesar el archivo: {e}")
+            run.rows, run.bytes = read.rows, read.bytes if loaded else query_span.bytes
+
+        except Exception as e:
+            print(f"Error al procesar el archivo: {e}")
+            results = [[] for _ in queries]
+
+        finally:
+            # Ante cualquier error, cierro la conexión (las sesiones quedan abiertas)
+            if conn is not None:
+                conn.close()
+            if spill_dir is not None:
+                spill_dir.cleanup()
+
+    return results
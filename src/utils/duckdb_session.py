@@ -0,0 +1,154 @@
+# imports nativos
+from typing import Callable, Dict, Optional, Tuple, Union
+from collections import OrderedDict
+import os
+import threading
+
+# imports externas
+import duckdb
+
+# imports propios
+from .duckdb_engine import load_source, count_rows, SOURCE_COLUMNS
+from .readers import source_version, FilePaths
+
+
+# Clave de una sesión: la ruta (o el patrón) absoluta, o la tupla de rutas de una lista
+SourceKey = Union[str, Tuple[str, ...]]
+
+
+class DuckDBSession:
+    """Conexión de DuckDB "caliente" para un archivo: se abre una sola vez,
+    deja cargada `farmers_protest_raw` (una tabla en memoria con las
+    columnas de todas las consultas, o una vista sobre la caché Parquet) y
+    se reutiliza en cada consulta. La entrada también puede ser una lista de
+    rutas, un patrón glob o una carpeta, cargados como una sola tabla.
+
+    Una conexión de DuckDB no admite consultas concurrentes desde varios
+    hilos, así que las consultas de una misma sesión se serializan. La
+    cantidad de filas se cuenta una sola vez al cargar (`rows`).
+    """
+
+    def __init__(
+        self,
+        file_path: FilePaths,
+        cache_dir: Optional[str] = None,
+        threads: Optional[int] = None,
+        memory_limit: Optional[str] = None
+    ):
+        config = {}
+        if threads is not None:
+            config['threads'] = threads
+        if memory_limit is not None:
+            config['memory_limit'] = memory_limit
+
+        self.file_path = file_path
+        self.cache_dir = cache_dir
+        self.version = source_version(file_path)
+        self.lock = threading.Lock()
+        self.conn = duckdb.connect(database=':memory:', config=config)
+        try:
+            load_source(self.conn, file_path, cache_dir, columns=SOURCE_COLUMNS, materialize=True)
+            self.rows = count_rows(self.conn)
+        except Exception:
+            self.conn.close()
+            raise
+
+    def query(self, query: Callable[[duckdb.DuckDBPyConnection], list]) -> list:
+        """Ejecuta una consulta sobre la tabla cargada.
+
+        Parameters:
+            query (Callable): Consulta a ejecutar sobre la conexión
+        Returns:
+            list: Resultado de la consulta
+        """
+        with self.lock:
+            return query(self.conn)
+
+    def is_stale(self) -> bool:
+        """Indica si el archivo cambió (tamaño o fecha de modificación) desde la
+        carga. Con un patrón glob o una carpeta, también si aparecieron o
+        desaparecieron archivos."""
+        return source_version(self.file_path) != self.version
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+
+class SessionManager:
+    """Registro de sesiones calientes, una por archivo (y carpeta de caché).
+
+    `get` devuelve la sesión existente o la crea cargando el archivo; si el
+    archivo cambió desde la carga, la sesión se descarta y se vuelve a
+    cargar. Con `max_sessions` se cierra la sesión usada hace más tiempo al
+    superar el límite; `evict` y `close` liberan sesiones explícitamente.
+    """
+
+    def __init__(
+        self,
+        threads: Optional[int] = None,
+        memory_limit: Optional[str] = None,
+        max_sessions: Optional[int] = None
+    ):
+        self.threads = threads
+        self.memory_limit = memory_limit
+        self.max_sessions = max_sessions
+        self.sessions: Dict[Tuple[SourceKey, Optional[str]], DuckDBSession] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, file_path: FilePaths, cache_dir: Optional[str] = None) -> DuckDBSession:
+        """Sesión caliente del archivo, creándola si hace falta.
+
+        Parameters:
+            file_path (FilePaths): Ruta al archivo NDJSON, lista de rutas, patrón glob o carpeta
+            cache_dir (Optional[str]): Carpeta para la caché columnar, None para no usarla
+        Returns:
+            DuckDBSession: Sesión con `farmers_protest_raw` cargada
+        """
+        key = (_source_key(file_path), cache_dir)
+        with self.lock:
+            session = self.sessions.get(key)
+            if session is not None and session.is_stale():
+                self.sessions.pop(key).close()
+                session = None
+
+            if session is None:
+                session = DuckDBSession(file_path, cache_dir, self.threads, self.memory_limit)
+                self.sessions[key] = session
+            self.sessions.move_to_end(key)
+
+            while self.max_sessions is not None and len(self.sessions) > self.max_sessions:
+                _, oldest = self.sessions.popitem(last=False)
+                oldest.close()
+
+            return session
+
+    def evict(self, file_path: FilePaths, cache_dir: Optional[str] = None) -> bool:
+        """Cierra la sesión de un archivo.
+
+        Parameters:
+            file_path (FilePaths): Ruta al archivo NDJSON, lista de rutas, patrón glob o carpeta
+            cache_dir (Optional[str]): Carpeta de caché con la que se creó la sesión
+        Returns:
+            bool: True si había una sesión abierta
+        """
+        with self.lock:
+            session = self.sessions.pop((_source_key(file_path), cache_dir), None)
+        if session is None:
+            return False
+        session.close()
+        return True
+
+    def close(self) -> None:
+        """Cierra todas las sesiones."""
+        with self.lock:
+            sessions = list(self.sessions.values())
+            self.sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+def _source_key(file_path: FilePaths) -> SourceKey:
+    if isinstance(file_path, (str, os.PathLike)):
+        return os.path.abspath(file_path)
+    return tuple(os.path.abspath(path) for path in file_path)
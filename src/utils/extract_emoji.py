@@ -1,16 +1,216 @@
 from typing import List
-import emoji
+from functools import lru_cache
+import re
+
+from emoji import EMOJI_DATA
+from emoji.unicode_codes import STATUS
+from emoji.tokenizer import get_search_tree
+
+
+# Caracteres con los que el tokenizador de `emoji` no equivale a una
+# búsqueda de la coincidencia más larga: el ZWJ (secuencias no RGI) y los
+# caracteres de etiqueta (banderas de subdivisiones como 🏴󠁧󠁢󠁥󠁮󠁧󠁿). Sintaxis RE2.
+TOKENIZER_ONLY_PATTERN = '[\\x{200D}\\x{E0000}-\\x{E007F}]'
+
+_ZWJ = '\u200d'
+_VARIATION_SELECTORS = ('\ufe0e', '\ufe0f')
+_COMPONENT = STATUS['component']
+
+# Árbol de prefijos de todos los emojis, el mismo que usa `emoji.emoji_list`.
+# Se construye una sola vez al importar el módulo
+_SEARCH_TREE = get_search_tree()
+
+# Posiciones donde puede empezar un emoji: rangos de código que cubren los
+# primeros caracteres no ASCII del árbol (unidos cuando los separan pocos
+# códigos, para que la clase de caracteres sea corta y rápida). Los emojis
+# que empiezan con un carácter ASCII (#, *, 0-9) siempre continúan con
+# U+FE0F o U+20E3, así que un '#' de un hashtag no es candidato
+_RANGE_GAP = 64
+
+
+def _candidate_pattern() -> str:
+    codes = sorted(ord(char) for char in _SEARCH_TREE if not char.isascii())
+    ranges = [[codes[0], codes[0]]]
+    for code in codes[1:]:
+        if code - ranges[-1][1] <= _RANGE_GAP:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+
+    non_ascii = ''.join(
+        re.escape(chr(first)) + (f"-{re.escape(chr(last))}" if last > first else '')
+        for first, last in ranges
+    )
+    ascii_roots = ''.join(re.escape(char) for char in _SEARCH_TREE if char.isascii())
+    return f"[{non_ascii}]|[{ascii_roots}](?=[\ufe0f\u20e3])"
+
+
+_CANDIDATE_RE = re.compile(_candidate_pattern())
 
 
 def extract_emojis(text) -> List[str]:
-    """Función para extraer emojis de un texto dado.
+    """Función para extraer emojis de un texto dado. Devuelve exactamente lo
+    mismo que `[e['emoji'] for e in emoji.emoji_list(text)]`, pero sin
+    construir un diccionario por coincidencia y descartando rápido los
+    textos que no pueden tener emojis.
 
     Parameters:
         text (str): Texto del cual extraer emojis.
     Returns:
         List[str]: Lista de emojis extraídos.
     """
-    # Usamos emoji.emoji_list() que devuelve información sobre cada emoji encontrado
-    emoji_list = emoji.emoji_list(text)
-    # Extraemos solo el texto del emoji (caracteres)
-    return [e['emoji'] for e in emoji_list]
\ No newline at end of file
+    # Ningún emoji es ASCII puro y `isascii` no recorre el texto
+    if text.isascii():
+        return []
+
+    # Las secuencias ZWJ no reconocidas requieren el tokenizador completo
+    if _ZWJ in text:
+        return _tokenize(text)
+
+    # Sin ZWJ el tokenizador equivale a recorrer el árbol desde cada
+    # posición candidata y quedarse con el nodo más profundo alcanzado
+    emojis = []
+    length = len(text)
+    search = _CANDIDATE_RE.search
+    match = search(text)
+    while match is not None:
+        start = match.start()
+        node = _SEARCH_TREE.get(text[start])
+        if node is None:  # Carácter dentro de un rango pero fuera del árbol
+            match = search(text, start + 1)
+            continue
+        end = start + 1
+        while end < length and text[end] in node:
+            node = node[text[end]]
+            end += 1
+        if 'data' in node:
+            emojis.append(text[start:end])
+            match = search(text, end)
+        else:
+            match = search(text, start + 1)
+    return emojis
+
+
+def _tokenize(text: str) -> List[str]:
+    """Port de `emoji.tokenizer.tokenize(text, keep_zwj=False)` que devuelve
+    solo los emojis. Conserva su manejo de secuencias ZWJ no RGI (une lo que
+    está en el árbol y separa el resto) usando tuplas en lugar de objetos.
+    """
+    emojis = []
+    # Tokens pendientes: (caracteres, es_emoji)
+    result = []
+    # Posiciones de ZWJ que unen emojis no RGI y se saltean
+    ignore = set()
+    i = 0
+    length = len(text)
+
+    while i < length:
+        consumed = False
+        char = text[i]
+
+        if i in ignore:
+            i += 1
+            continue
+
+        elif char in _SEARCH_TREE:
+            j = i + 1
+            node = _SEARCH_TREE[char]
+            while j < length and text[j] in node:
+                if j in ignore:
+                    break
+                node = node[text[j]]
+                j += 1
+            if 'data' in node:
+                result.append((text[i:j], True))
+                i = j - 1
+                consumed = True
+
+        elif (
+            char == _ZWJ
+            and result
+            and result[-1][0] in EMOJI_DATA
+            and i > 0
+            and text[i - 1] in _SEARCH_TREE
+        ):
+            # ZWJ después de un emoji: se ignora y se vuelve a leer el emoji
+            ignore.add(i)
+            if EMOJI_DATA[result[-1][0]]['status'] == _COMPONENT:
+                # ZWJ+EMOJI+COMPONENT o ZWJ+COMPONENT
+                i = i - sum(len(chars) for chars, _ in result[-2:])
+                if text[i] == _ZWJ:
+                    i += 1
+                    del result[-1]
+                else:
+                    del result[-2:]
+            else:
+                i = i - len(result[-1][0])
+                del result[-1]
+            continue
+
+        elif result:
+            emojis.extend(chars for chars, is_emoji in result if is_emoji)
+            result = []
+
+        if not consumed and char not in _VARIATION_SELECTORS:
+            result.append((char, False))
+        i += 1
+
+    emojis.extend(chars for chars, is_emoji in result if is_emoji)
+    return emojis
+
+
+@lru_cache(maxsize=None)
+def emoji_regex() -> str:
+    """Construye una expresión regular con todos los emojis del paquete
+    `emoji`, organizada como el mismo árbol de prefijos que usa su
+    tokenizador y prefiriendo siempre la coincidencia más larga.
+
+    En textos sin los caracteres de `TOKENIZER_ONLY_PATTERN`, extraer todas
+    las coincidencias de esta expresión devuelve exactamente lo mismo que
+    `extract_emojis` (incluidos modificadores de tono de piel y secuencias
+    ZWJ reconocidas). La sintaxis es compatible con RE2 (DuckDB) y con `re`.
+
+    Returns:
+        str: Expresión regular
+    """
+    return _trie_pattern(_SEARCH_TREE)
+
+
+def _trie_pattern(node: dict) -> str:
+    alternatives = []
+    for char in sorted(key for key in node if key != 'data'):
+        child = node[char]
+        pattern = re.escape(char)
+        if any(key != 'data' for key in child):
+            # El sufijo es opcional solo si el prefijo ya es un emoji completo
+            pattern += f"(?:{_trie_pattern(child)})" + ('?' if 'data' in child else '')
+        alternatives.append(pattern)
+    return '|'.join(alternatives)
+
+
+@lru_cache(maxsize=None)
+def non_emoji_run_regex() -> str:
+    """Construye una expresión regular para tramos de caracteres que no
+    forman parte de ningún emoji (ni como base, modificador, selector de
+    variación, ZWJ o etiqueta). Ninguna coincidencia del tokenizador cruza
+    esos caracteres, así que separar el texto por estos tramos y extraer los
+    emojis de cada fragmento da exactamente lo mismo que `extract_emojis`
+    sobre el texto completo. La sintaxis es compatible con RE2 y con `re`.
+
+    Returns:
+        str: Expresión regular
+    """
+    code_points = sorted({ord(char) for symbol in EMOJI_DATA for char in symbol})
+    ranges = []
+    for code_point in code_points:
+        if ranges and code_point == ranges[-1][1] + 1:
+            ranges[-1][1] = code_point
+        else:
+            ranges.append([code_point, code_point])
+
+    escape = lambda code_point: re.escape(chr(code_point))
+    charset = ''.join(
+        escape(first) if first == last else f"{escape(first)}-{escape(last)}"
+        for first, last in ranges
+    )
+    return f"[^{charset}]+"
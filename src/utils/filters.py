@@ -0,0 +1,114 @@
+# imports nativos
+from typing import FrozenSet, Iterable, Optional, Union
+from datetime import date
+import re
+
+
+# Clave `date` con el prefijo `YYYY-MM-DD` de su valor, sobre la línea cruda
+_DATE_RE = re.compile(r'"date"\s*:\s*"(\d{4}-\d{2}-\d{2})')
+_DATE_RE_BYTES = re.compile(_DATE_RE.pattern.encode('ascii'))
+
+# Fecha aceptada como extremo de un rango: `date`, `datetime` o texto ISO
+DateLike = Union[date, str]
+
+
+class TweetFilter:
+    """Filtro de tweets por rango de fechas y por autor, que los motores
+    empujan hasta la lectura: el escaneo en streaming descarta las líneas
+    fuera del rango antes de decodificarlas (ver `accepts_line`), DuckDB lo
+    agrega al `WHERE` sobre el escaneo del archivo y Arrow filtra cada lote.
+
+    Las fechas son, como en q1, el prefijo `YYYY-MM-DD` del campo `date`
+    (la fecha local en que se publicó el tweet). El rango es inclusivo y un
+    extremo `None` queda abierto.
+
+    Parameters:
+        start_date (Optional[DateLike]): Primera fecha incluida
+        end_date (Optional[DateLike]): Última fecha incluida
+        users (Optional[Iterable[str]]): Autores (`user.username`) a incluir, None para todos
+    """
+
+    def __init__(
+        self,
+        start_date: Optional[DateLike] = None,
+        end_date: Optional[DateLike] = None,
+        users: Optional[Iterable[str]] = None
+    ):
+        self.start = _day(start_date)
+        self.end = _day(end_date)
+        if isinstance(users, str):
+            users = [users]
+        self.users: Optional[FrozenSet[str]] = None if users is None else frozenset(users)
+
+    def accepts_day(self, day: str) -> bool:
+        """Indica si una fecha `YYYY-MM-DD` está dentro del rango."""
+        return (self.start is None or day >= self.start) and (self.end is None or day <= self.end)
+
+    def accepts_line(self, line: Union[str, bytes]) -> bool:
+        """Rechazo temprano sobre la línea cruda, sin decodificar el JSON:
+        busca la clave `date` del objeto raíz y compara el prefijo de su
+        valor con el rango. Solo descarta líneas que seguro quedan afuera;
+        ante cualquier duda (sin clave, o la primera `date` dentro de un
+        objeto anidado) la acepta y decide `accepts` con el tweet decodificado.
+
+        Parameters:
+            line (str | bytes): Línea NDJSON
+        Returns:
+            bool: False si la línea está fuera del rango de fechas
+        """
+        if self.start is None and self.end is None:
+            return True
+        if isinstance(line, bytes):
+            match, brace = _DATE_RE_BYTES.search(line), b'{'
+        else:
+            match, brace = _DATE_RE.search(line), '{'
+        if match is None:
+            return True
+        # Si antes de la clave se abrió otro objeto, puede no ser la del tweet
+        nested = line.find(brace, 1)
+        if nested != -1 and nested < match.start():
+            return True
+        day = match.group(1)
+        return self.accepts_day(day.decode('ascii') if isinstance(day, bytes) else day)
+
+    def accepts(self, tweet: dict) -> bool:
+        """Indica si un tweet decodificado (completo o proyectado) pasa el filtro."""
+        timestamp = tweet.get('date')
+        if not isinstance(timestamp, str) or not self.accepts_day(timestamp[:10]):
+            return False
+        if self.users is not None:
+            user = tweet.get('user')
+            return isinstance(user, dict) and user.get('username') in self.users
+        return True
+
+    def __repr__(self) -> str:
+        users = None if self.users is None else sorted(self.users)
+        return f"TweetFilter(start_date={self.start!r}, end_date={self.end!r}, users={users!r})"
+
+
+def make_filter(
+    start_date: Optional[DateLike] = None,
+    end_date: Optional[DateLike] = None,
+    users: Optional[Iterable[str]] = None
+) -> Optional[TweetFilter]:
+    """Filtro para los parámetros de una consulta, o None si no filtran nada.
+
+    Parameters:
+        start_date (Optional[DateLike]): Primera fecha incluida
+        end_date (Optional[DateLike]): Última fecha incluida
+        users (Optional[Iterable[str]]): Autores a incluir
+    Returns:
+        (Optional[TweetFilter]): Filtro, None sin restricciones
+    """
+    if start_date is None and end_date is None and users is None:
+        return None
+    return TweetFilter(start_date, end_date, users)
+
+
+def _day(value: Optional[DateLike]) -> Optional[str]:
+    """Normaliza un extremo del rango a `YYYY-MM-DD`, validándolo."""
+    if value is None:
+        return None
+    if isinstance(value, date):
+        return value.isoformat()[:10]
+    return date.fromisoformat(value[:10]).isoformat()
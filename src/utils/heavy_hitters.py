@@ -0,0 +1,162 @@
+# imports nativos
+from typing import Counter as CounterType, Hashable, Iterable, List, Optional, Tuple, Union
+from collections import Counter
+import heapq
+
+
+class SpaceSaving:
+    """Contador aproximado de elementos frecuentes (algoritmo Space-Saving)
+    con memoria fija: nunca guarda más de `capacity` contadores.
+
+    Cuando llega un elemento nuevo y no hay lugar, reemplaza al de menor
+    cuenta y hereda esa cuenta como error. Para cada elemento guardado se
+    cumple `real <= cuenta <= real + error`, con `error <= total / capacity`,
+    y todo elemento con frecuencia real mayor a `total / capacity` está
+    garantizado en el resumen.
+
+    Expone la misma interfaz que usan los acumuladores sobre `Counter`
+    (`update` con elementos u otro resumen y `most_common`).
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError('capacity debe ser al menos 1')
+        self.capacity = capacity
+        self.total = 0
+        self.counts = {}
+        self.errors = {}
+        # Montículo perezoso (cuenta, orden, elemento): las entradas pueden
+        # quedar con una cuenta vieja, que siempre es menor o igual a la real
+        self._heap = []
+        self._order = 0
+
+    def update(self, items: Union[Iterable[Hashable], 'SpaceSaving']) -> None:
+        """Suma una ocurrencia por cada elemento, o combina otro resumen.
+
+        Parameters:
+            items (Iterable | SpaceSaving): Elementos observados u otro resumen
+        """
+        if isinstance(items, SpaceSaving):
+            self._merge(items)
+            return
+
+        counts = self.counts
+        for item in items:
+            self.total += 1
+            if item in counts:
+                counts[item] += 1
+            elif len(counts) < self.capacity:
+                self._insert(item, 1, 0)
+            else:
+                floor = self._pop_min()
+                self._insert(item, floor + 1, floor)
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """Elementos con mayor cuenta estimada, como `Counter.most_common`.
+
+        Parameters:
+            n (Optional[int]): Cantidad de elementos, None para todos
+        Returns:
+            (List[Tuple[Hashable, int]]): Lista de tuplas (elemento, cuenta estimada)
+        """
+        ranking = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        return ranking if n is None else ranking[:n]
+
+    def error_bound(self) -> int:
+        """Sobreestimación máxima de cualquier cuenta del resumen.
+
+        Returns:
+            int: Cota del error, 0 si el resumen nunca descartó elementos
+        """
+        return self._floor()
+
+    def is_exact_top(self, n: int) -> bool:
+        """Indica si los `n` primeros de `most_common(n)` son con certeza los
+        `n` elementos más frecuentes: la cuenta mínima garantizada de cada uno
+        supera la cuenta estimada de cualquier otro elemento.
+
+        Parameters:
+            n (int): Tamaño del ranking
+        Returns:
+            bool: True si el conjunto del top `n` está garantizado
+        """
+        ranking = self.most_common(n + 1)
+        # Un elemento fuera del resumen puede tener a lo sumo `floor` ocurrencias
+        rival = self._floor()
+        if len(ranking) > n:
+            rival = max(rival, ranking[n][1])
+        return all(count - self.errors[item] > rival for item, count in ranking[:n])
+
+    def _insert(self, item: Hashable, count: int, error: int) -> None:
+        self.counts[item] = count
+        self.errors[item] = error
+        self._order += 1
+        heapq.heappush(self._heap, (count, self._order, item))
+
+    def _pop_min(self) -> int:
+        """Quita el elemento de menor cuenta y devuelve esa cuenta."""
+        heap = self._heap
+        while True:
+            count, _, item = heapq.heappop(heap)
+            current = self.counts.get(item)
+            if current is None:  # Entrada de un elemento ya reemplazado
+                continue
+            if current != count:  # Entrada vieja: se reinserta con la cuenta real
+                self._order += 1
+                heapq.heappush(heap, (current, self._order, item))
+                continue
+            del self.counts[item]
+            del self.errors[item]
+            return count
+
+    def _floor(self) -> int:
+        """Cuenta mínima del resumen si está lleno, 0 si todavía hay lugar."""
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def _merge(self, other: 'SpaceSaving') -> None:
+        """Combina otro resumen conservando la garantía de Space-Saving: a un
+        elemento ausente en uno de los resúmenes se le suma la cuenta mínima
+        de ese resumen, que acota sus ocurrencias no registradas.
+        """
+        own_floor, other_floor = self._floor(), other._floor()
+        counts, errors = {}, {}
+        for item in list(self.counts) + [item for item in other.counts if item not in self.counts]:
+            own = item in self.counts
+            theirs = item in other.counts
+            counts[item] = (
+                (self.counts[item] if own else own_floor)
+                + (other.counts[item] if theirs else other_floor)
+            )
+            errors[item] = (
+                (self.errors[item] if own else own_floor)
+                + (other.errors[item] if theirs else other_floor)
+            )
+
+        # Se conservan los `capacity` de mayor cuenta, en orden de aparición ante empates
+        kept = sorted(counts, key=counts.get, reverse=True)[:self.capacity]
+        kept_set = set(kept)
+        self.total += other.total
+        self.counts = {item: counts[item] for item in counts if item in kept_set}
+        self.errors = {item: errors[item] for item in self.counts}
+        self._heap = []
+        self._order = 0
+        for item, count in self.counts.items():
+            self._order += 1
+            self._heap.append((count, self._order, item))
+        heapq.heapify(self._heap)
+
+
+def new_counter(max_counters: Optional[int] = None) -> Union[CounterType, SpaceSaving]:
+    """Crea el contador de un acumulador: exacto (`Counter`) por defecto o
+    aproximado con memoria fija si se indica `max_counters`.
+
+    Parameters:
+        max_counters (Optional[int]): Contadores máximos en memoria, None para conteo exacto
+    Returns:
+        (Counter | SpaceSaving): Contador a utilizar
+    """
+    if max_counters is None:
+        return Counter()
+    return SpaceSaving(max_counters)
@@ -0,0 +1,102 @@
+# imports nativos
+from typing import BinaryIO, Generator, Iterable
+from queue import Queue
+import threading
+
+
+# Tamaño de cada bloque y cantidad de bloques que el hilo de lectura puede
+# tener listos por delante del consumidor
+BLOCK_SIZE = 1024 * 1024
+QUEUE_DEPTH = 8
+
+
+class Prefetch:
+    """Configuración de la lectura anticipada: un hilo en segundo plano lee
+    bloques de `block_size` bytes y los deja en una cola de hasta `depth`
+    bloques mientras el hilo principal decodifica y agrega. La memoria en
+    vuelo queda acotada a alrededor de `block_size * (depth + 2)` bytes.
+    Con `depth=0` se lee por bloques en el mismo hilo, sin solapamiento.
+
+    Parameters:
+        block_size (int): Bytes por bloque
+        depth (int): Bloques máximos en espera en la cola, 0 para leer en el mismo hilo
+    """
+
+    def __init__(self, block_size: int = BLOCK_SIZE, depth: int = QUEUE_DEPTH):
+        if block_size < 1 or depth < 0:
+            raise ValueError('block_size debe ser mayor a 0 y depth no puede ser negativo')
+        self.block_size = block_size
+        self.depth = depth
+
+    def __repr__(self) -> str:
+        return f"Prefetch(block_size={self.block_size}, depth={self.depth})"
+
+
+def prefetch(blocks: Iterable[bytes], depth: int = QUEUE_DEPTH) -> Generator[bytes, None, None]:
+    """Consume `blocks` desde un hilo en segundo plano, de modo que la
+    lectura (o descompresión) del siguiente bloque se solapa con el
+    procesamiento del actual. La cola acotada limita la memoria a `depth`
+    bloques. Si el consumidor se detiene antes de terminar, el hilo se
+    detiene en el próximo bloque y `blocks` se cierra.
+
+    Parameters:
+        blocks (Iterable[bytes]): Bloques a leer, por ejemplo un generador sobre un archivo
+        depth (int): Bloques máximos en espera
+    Yields:
+        bytes: Los mismos bloques, en orden
+    """
+    blocks = iter(blocks)
+    queue = Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for block in blocks:
+                if stop.is_set():
+                    return
+                queue.put(block)
+            queue.put(None)
+        except Exception as e:  # Se propaga al consumidor
+            queue.put(e)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            block = queue.get()
+            if block is None:
+                return
+            if isinstance(block, Exception):
+                raise block
+            yield block
+    finally:
+        stop.set()
+        # Libero un lugar por si el hilo quedó bloqueado en `put`
+        while thread.is_alive():
+            while not queue.empty():
+                queue.get_nowait()
+            thread.join(timeout=0.01)
+        close = getattr(blocks, 'close', None)
+        if close is not None:
+            close()
+
+
+def prefetch_blocks(
+    stream: BinaryIO,
+    block_size: int = BLOCK_SIZE,
+    depth: int = QUEUE_DEPTH
+) -> Generator[bytes, None, None]:
+    """Lee el flujo en bloques con `prefetch`. El flujo se cierra al
+    terminar o si el consumidor se detiene.
+
+    Parameters:
+        stream (BinaryIO): Flujo binario a leer
+        block_size (int): Bytes por bloque
+        depth (int): Bloques máximos en espera
+    Yields:
+        bytes: Bloques del flujo, en orden
+    """
+    try:
+        yield from prefetch(iter(lambda: stream.read(block_size), b''), depth)
+    finally:
+        stream.close()
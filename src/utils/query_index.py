@@ -0,0 +1,185 @@
+# imports nativos
+from typing import List, Optional, Tuple
+from collections import Counter, defaultdict
+from datetime import date
+import functools
+import heapq
+
+# imports propios
+from .aggregators import Accumulator
+from .extract_emoji import extract_emojis
+
+
+# Rankings por rango de fechas que se guardan ya calculados
+RANGE_CACHE_SIZE = 256
+
+
+class TweetIndexAccumulator(Accumulator):
+    """Índices preagregados del dataset para responder top N por rango de
+    fechas sin volver a leer el archivo: tweets por fecha, tweets por
+    (fecha, usuario), y emojis y menciones por fecha y en total.
+
+    Se alimenta con el escaneo compartido (`run_scan`), así que admite
+    varios archivos, procesos en paralelo y checkpoints. Las fechas son el
+    prefijo `YYYY-MM-DD` del tweet, como en q1. Los usuarios se guardan con
+    un id entero (ver `TopDatesUserAccumulator`). Los totales de emojis y
+    menciones se cuentan aparte para que, sin rango, los empates se
+    resuelvan igual que en q2 y q3.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.user_ids = {}  # usuario -> id
+        self.usernames = []  # id -> usuario
+        self.date_counts = {}  # 'YYYY-MM-DD' -> tweets
+        self.date_user_counts = defaultdict(dict)  # 'YYYY-MM-DD' -> {id: tweets}
+        self.date_emojis = defaultdict(Counter)
+        self.date_mentions = defaultdict(Counter)
+        self.emoji_counter = Counter()
+        self.mention_counter = Counter()
+
+    def update(self, tweet: dict) -> None:
+        day = tweet['date'][:10]
+        self.rows += 1
+        self.date_counts[day] = self.date_counts.get(day, 0) + 1
+
+        user_id = self._user_id(tweet['user']['username'])
+        user_counts = self.date_user_counts[day]
+        user_counts[user_id] = user_counts.get(user_id, 0) + 1
+
+        content = tweet.get('renderedContent')
+        if content:
+            emojis = extract_emojis(content)
+            if emojis:
+                self.emoji_counter.update(emojis)
+                self.date_emojis[day].update(emojis)
+
+        mentioned_users = tweet.get('mentionedUsers')
+        if mentioned_users:
+            try:
+                usernames = [mention['username'] for mention in mentioned_users]
+            except (TypeError, KeyError):
+                return
+            self.mention_counter.update(usernames)
+            self.date_mentions[day].update(usernames)
+
+    def merge(self, other: 'TweetIndexAccumulator') -> None:
+        self.rows += other.rows
+        for day, count in other.date_counts.items():
+            self.date_counts[day] = self.date_counts.get(day, 0) + count
+
+        # Los ids del otro acumulador se traducen a los de este
+        remap = [self._user_id(username) for username in other.usernames]
+        for day, other_counts in other.date_user_counts.items():
+            user_counts = self.date_user_counts[day]
+            for other_id, count in other_counts.items():
+                user_id = remap[other_id]
+                user_counts[user_id] = user_counts.get(user_id, 0) + count
+
+        for day, counter in other.date_emojis.items():
+            self.date_emojis[day].update(counter)
+        for day, counter in other.date_mentions.items():
+            self.date_mentions[day].update(counter)
+        self.emoji_counter.update(other.emoji_counter)
+        self.mention_counter.update(other.mention_counter)
+
+    def result(self) -> 'TweetIndex':
+        return TweetIndex(self)
+
+    def _user_id(self, username: str) -> int:
+        user_id = self.user_ids.get(username)
+        if user_id is None:
+            user_id = self.user_ids[username] = len(self.usernames)
+            self.usernames.append(username)
+        return user_id
+
+
+class TweetIndex:
+    """Índices de solo lectura construidos por `TweetIndexAccumulator`.
+
+    Sin rango de fechas, los rankings salen de listas ya ordenadas y cada
+    consulta es un corte de lista. Con rango, se combinan los índices de las
+    fechas incluidas y el ranking completo queda en una caché LRU, de modo
+    que repetir el rango con otro `n` vuelve a ser un corte. Los rangos son
+    inclusivos en ambos extremos y `None` deja el extremo abierto.
+
+    Parameters:
+        index (TweetIndexAccumulator): Estado agregado del escaneo
+    """
+
+    def __init__(self, index: TweetIndexAccumulator):
+        self.rows = index.rows
+        self.date_counts = index.date_counts
+        self.date_user_counts = index.date_user_counts
+        self.date_emojis = index.date_emojis
+        self.date_mentions = index.date_mentions
+        self.usernames = index.usernames
+
+        # Usuario más activo de cada fecha; ante empates gana el primero en aparecer
+        self.date_top_user = {
+            day: index.usernames[max(user_counts, key=user_counts.get)]
+            for day, user_counts in index.date_user_counts.items()
+        }
+        # Orden estable: ante empates queda primero lo que apareció antes, como `most_common`
+        self.emojis = sorted(index.emoji_counter.items(), key=lambda item: item[1], reverse=True)
+        self.mentions = sorted(index.mention_counter.items(), key=lambda item: item[1], reverse=True)
+        self._ranked = functools.lru_cache(maxsize=RANGE_CACHE_SIZE)(self._rank)
+
+    @property
+    def days(self) -> List[date]:
+        """Fechas con tweets, ordenadas."""
+        return [date.fromisoformat(day) for day in sorted(self.date_counts)]
+
+    def top_dates(self, n: int = 10, start: Optional[date] = None, end: Optional[date] = None) -> List[Tuple[date, str]]:
+        """Q1: las `n` fechas con más tweets del rango y el usuario más activo en cada una.
+
+        Parameters:
+            n (int): Cantidad de fechas
+            start (Optional[date]): Primera fecha del rango, None sin límite
+            end (Optional[date]): Última fecha del rango, None sin límite
+        Returns:
+            (List[Tuple[date, str]]): Lista de tuplas (fecha, usuario)
+        """
+        days = self._days(_bound(start), _bound(end))
+        top_days = heapq.nlargest(n, days, key=self.date_counts.get)
+        return [(date.fromisoformat(day), self.date_top_user[day]) for day in top_days]
+
+    def top_emojis(self, n: int = 10, start: Optional[date] = None, end: Optional[date] = None) -> List[Tuple[str, int]]:
+        """Q2: los `n` emojis más usados en el rango (ver `top_dates`)."""
+        if start is None and end is None:
+            return self.emojis[:n]
+        return self._ranked('emojis', _bound(start), _bound(end))[:n]
+
+    def top_mentions(self, n: int = 10, start: Optional[date] = None, end: Optional[date] = None) -> List[Tuple[str, int]]:
+        """Q3: los `n` usuarios más mencionados en el rango (ver `top_dates`)."""
+        if start is None and end is None:
+            return self.mentions[:n]
+        return self._ranked('mentions', _bound(start), _bound(end))[:n]
+
+    def top_users(self, n: int = 10, start: Optional[date] = None, end: Optional[date] = None) -> List[Tuple[str, int]]:
+        """Los `n` usuarios con más tweets en el rango (ver `top_dates`)."""
+        return self._ranked('users', _bound(start), _bound(end))[:n]
+
+    def _days(self, start: Optional[str], end: Optional[str]) -> List[str]:
+        """Fechas del índice dentro del rango, en orden de aparición."""
+        return [
+            day for day in self.date_counts
+            if (start is None or day >= start) and (end is None or day <= end)
+        ]
+
+    def _rank(self, kind: str, start: Optional[str], end: Optional[str]) -> List[Tuple[str, int]]:
+        """Ranking completo de un tipo de índice en el rango (cacheado en `_ranked`)."""
+        counter = Counter()
+        for day in self._days(start, end):
+            if kind == 'users':
+                for user_id, count in self.date_user_counts[day].items():
+                    counter[self.usernames[user_id]] += count
+            elif kind == 'emojis':
+                counter.update(self.date_emojis.get(day, {}))
+            else:
+                counter.update(self.date_mentions.get(day, {}))
+        return counter.most_common()
+
+
+def _bound(day: Optional[date]) -> Optional[str]:
+    return None if day is None else day.isoformat()
@@ -0,0 +1,383 @@
+# imports nativos
+from typing import Callable, Generator, List, Optional, Sequence, Tuple, Union
+import glob
+import mmap
+import os
+import re
+
+# imports externas
+import ujson
+try:
+    import orjson
+except ImportError:  # Dependencia opcional: sin orjson los lotes se decodifican con ujson
+    orjson = None
+
+# imports propios
+from .compression import compression_of, read_compressed_lines, open_decompressed
+from .prefetch import prefetch, prefetch_blocks, Prefetch, BLOCK_SIZE, QUEUE_DEPTH
+
+
+# Decodificador de los lotes de `decode_batches`: orjson si está instalado
+BATCH_DECODER = 'ujson' if orjson is None else 'orjson'
+_batch_loads = ujson.loads if orjson is None else orjson.loads
+
+# Bytes por bloque y líneas por lote de `decode_batches` (ver `benchmarks.bench_decode`)
+BATCH_BLOCK_SIZE = 64 * 1024
+BATCH_SIZE = 128
+
+# Entrada de las consultas: una ruta, un patrón glob, una carpeta o una lista de ellos
+FilePaths = Union[str, Sequence[str]]
+
+
+def expand_paths(file_path: FilePaths) -> List[str]:
+    """Resuelve la entrada de una consulta a la lista ordenada de archivos a
+    leer. Una carpeta aporta sus archivos (no ocultos, sin recorrer
+    subcarpetas) y un patrón glob los que coinciden, ambos ordenados por
+    nombre, de modo que fragmentos horarios con fecha en el nombre quedan en
+    orden cronológico. Una lista conserva el orden dado, incluidas las rutas
+    repetidas, que se leen tantas veces como aparecen. Una carpeta o un
+    patrón no repiten archivos ya incluidos por una entrada anterior.
+    Procesar el resultado equivale a procesar la concatenación de los
+    archivos.
+
+    Parameters:
+        file_path (FilePaths): Ruta, patrón glob, carpeta o lista de ellos
+    Returns:
+        (List[str]): Rutas de los archivos
+    Raises:
+        FileNotFoundError: Si alguna entrada no corresponde a ningún archivo
+    """
+    entries = [file_path] if isinstance(file_path, (str, os.PathLike)) else list(file_path)
+
+    paths = []
+    for entry in entries:
+        entry = os.fspath(entry)
+        if os.path.isdir(entry):
+            matches = sorted(
+                os.path.join(entry, name) for name in os.listdir(entry)
+                if not name.startswith('.') and os.path.isfile(os.path.join(entry, name))
+            )
+        elif not os.path.exists(entry) and glob.has_magic(entry):
+            matches = sorted(path for path in glob.glob(entry) if os.path.isfile(path))
+        else:
+            paths.append(entry)  # Una ruta inexistente falla al abrirla, como antes
+            continue
+        if not matches:
+            raise FileNotFoundError(f"No se encontraron archivos para {entry}")
+        seen = set(paths)
+        paths.extend(path for path in matches if path not in seen)
+    if not paths:
+        raise FileNotFoundError("No se indicó ningún archivo")
+    return paths
+
+
+def source_version(file_path: FilePaths) -> Tuple[Tuple[str, int, int], ...]:
+    """Versión barata de la entrada: (ruta, tamaño, fecha de modificación)
+    de cada archivo. Cambia si un archivo se modifica o, con un patrón glob
+    o una carpeta, si aparecen o desaparecen archivos.
+
+    Parameters:
+        file_path (FilePaths): Ruta, patrón glob, carpeta o lista de ellos
+    Returns:
+        tuple: Versión de cada archivo, en el orden de `expand_paths`
+    """
+    versions = []
+    for path in expand_paths(file_path):
+        stat = os.stat(path)
+        versions.append((path, stat.st_size, stat.st_mtime_ns))
+    return tuple(versions)
+
+
+def describe_paths(file_path: FilePaths) -> str:
+    """Texto corto de la entrada para los spans: la ruta o el patrón tal
+    cual, o la cantidad de rutas de una lista."""
+    if isinstance(file_path, (str, os.PathLike)):
+        return os.fspath(file_path)
+    return f"{len(file_path)} rutas"
+
+
+def process_tweets(
+    file_path: str,
+    start: int = 0,
+    end: Optional[int] = None,
+    line_filter: Optional[Callable[[bytes], bool]] = None,
+    prefetch: Optional[Prefetch] = None
+) -> Generator[dict, None, None]:
+    """Generador que lee el archivo línea por línea y devuelve cada tweet
+    decodificado. Utiliza ujson para una carga rápida y descarta las líneas
+    que no son JSON válido. Las líneas se leen como bytes (ver
+    `read_raw_lines`), sin decodificarlas antes a texto. Con `prefetch` un
+    hilo en segundo plano lee los bloques siguientes mientras se decodifica
+    (ver `read_prefetched_lines`).
+
+    Parameters:
+        file_path (str): Ruta al archivo NDJSON
+        start (int): Byte de inicio del rango a leer (ver `split_ranges`)
+        end (Optional[int]): Byte de fin del rango, None para leer hasta el final
+        line_filter (Optional[Callable]): Rechazo temprano sobre la línea cruda: las
+            líneas para las que devuelve False no se decodifican (ver `TweetFilter.accepts_line`)
+        prefetch (Optional[Prefetch]): Bloque y profundidad de la lectura anticipada, None para
+            leer en el mismo hilo
+    Yields:
+        dict: Tweet decodificado
+    """
+    if prefetch is None:
+        lines = read_raw_lines(file_path, start, end)
+    else:
+        lines = read_prefetched_lines(file_path, start, end, prefetch)
+
+    for line in lines:
+        if line_filter is not None and not line_filter(line):
+            continue
+        try:
+            yield ujson.loads(line)  # Cargar el tweet directamente desde los bytes
+        except (KeyError, ValueError, ujson.JSONDecodeError):
+            continue
+
+
+def decode_batches(
+    file_path: str,
+    start: int = 0,
+    end: Optional[int] = None,
+    line_filter: Optional[Callable[[bytes], bool]] = None,
+    prefetch: Optional[Prefetch] = None,
+    batch_size: int = BATCH_SIZE
+) -> Generator[List[dict], None, None]:
+    """Generador de lotes de tweets decodificados. Lee el archivo por
+    bloques de líneas completas, corta cada bloque en líneas de una sola
+    vez y decodifica cada lote de hasta `batch_size` líneas con una única
+    llamada en C (`list.extend(map(loads, ...))`), sin pasar por el
+    intérprete en cada línea. Usa orjson si está instalado y si no ujson
+    (ver `BATCH_DECODER`). Las líneas que no son JSON válido se descartan,
+    igual que en `process_tweets`.
+
+    Parameters:
+        file_path (str): Ruta al archivo NDJSON
+        start (int): Byte de inicio del rango a leer (ver `split_ranges`)
+        end (Optional[int]): Byte de fin del rango, None para leer hasta el final
+        line_filter (Optional[Callable]): Rechazo temprano sobre la línea cruda (ver `process_tweets`)
+        prefetch (Optional[Prefetch]): Lectura anticipada en segundo plano (ver `process_tweets`)
+        batch_size (int): Líneas máximas por lote
+    Yields:
+        List[dict]: Tweets decodificados de un lote, en el orden del archivo
+    """
+    if prefetch is None:
+        block_size, depth = BATCH_BLOCK_SIZE, 0
+    else:
+        block_size, depth = prefetch.block_size, prefetch.depth
+
+    for block in read_line_blocks(file_path, block_size, start, end, depth):
+        lines = block.split(b'\n')
+        if not lines[-1]:  # El bloque termina en un salto de línea
+            lines.pop()
+        if line_filter is not None:
+            lines = [line for line in lines if line_filter(line)]
+        for index in range(0, len(lines), batch_size):
+            tweets = _decode_lines(lines[index:index + batch_size])
+            if tweets:
+                yield tweets
+
+
+def _decode_lines(lines: List[bytes]) -> List[dict]:
+    """Decodifica un lote de líneas y descarta las que no son JSON válido."""
+    tweets = []
+    remaining = iter(lines)
+    while True:
+        try:
+            # Si una línea falla, `extend` conserva lo decodificado hasta ahí
+            # y `remaining` ya la consumió: se sigue con la siguiente
+            tweets.extend(map(_batch_loads, remaining))
+            return tweets
+        except (KeyError, ValueError, ujson.JSONDecodeError):
+            continue
+
+
+def read_raw_lines(file_path: str, start: int = 0, end: Optional[int] = None) -> Generator[bytes, None, None]:
+    """Generador de líneas del archivo como bytes, sin decodificar a texto:
+    ujson las decodifica directamente. El archivo se mapea en memoria y se
+    busca cada salto de línea sobre el mapa, sin lecturas por línea ni una
+    copia intermedia a `str`. Devuelve las líneas que comienzan dentro de
+    [start, end); los archivos comprimidos se leen completos.
+
+    Parameters:
+        file_path (str): Ruta al archivo NDJSON
+        start (int): Byte de inicio del rango (debe ser inicio de línea)
+        end (Optional[int]): Byte de fin del rango, None para leer hasta el final
+    Yields:
+        bytes: Línea del archivo, sin el salto de línea
+    """
+    if compression_of(file_path) is not None:
+        if start != 0 or end is not None:
+            raise ValueError('Los archivos comprimidos no admiten lectura por rangos')
+        yield from read_compressed_lines(file_path)
+        return
+
+    if os.path.getsize(file_path) == 0:  # mmap no admite archivos vacíos
+        return
+
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        size = len(mapped)
+        stop = size if end is None else min(end, size)
+        find = mapped.find
+        position = start
+        while position < stop:
+            newline = find(b'\n', position)
+            if newline == -1:
+                newline = size
+            yield mapped[position:newline]
+            position = newline + 1
+
+
+def read_prefetched_lines(
+    file_path: str,
+    start: int = 0,
+    end: Optional[int] = None,
+    prefetch: Optional[Prefetch] = None
+) -> Generator[bytes, None, None]:
+    """Generador de líneas leídas por bloques desde un hilo en segundo plano
+    (ver `utils.prefetch`): mientras el consumidor decodifica y agrega las
+    líneas de un bloque, el hilo ya está leyendo los siguientes, así que las
+    esperas de disco o de red no frenan a la CPU. Cada bloque se corta en
+    líneas de una sola vez. Devuelve las mismas líneas que `read_raw_lines`
+    para el rango [start, end).
+
+    Parameters:
+        file_path (str): Ruta al archivo NDJSON
+        start (int): Byte de inicio del rango (debe ser inicio de línea)
+        end (Optional[int]): Byte de fin del rango, None para leer hasta el final
+        prefetch (Optional[Prefetch]): Bloque y profundidad de la cola, None para los valores por defecto
+    Yields:
+        bytes: Línea del archivo, sin el salto de línea
+    """
+    prefetch = prefetch or Prefetch()
+    for block in read_line_blocks(file_path, prefetch.block_size, start, end, prefetch.depth):
+        lines = block.split(b'\n')
+        if not lines[-1]:  # El bloque termina en un salto de línea
+            lines.pop()
+        yield from lines
+
+
+def read_line_blocks(
+    file_path: str,
+    block_size: int = BLOCK_SIZE,
+    start: int = 0,
+    end: Optional[int] = None,
+    depth: int = 0
+) -> Generator[bytes, None, None]:
+    """Generador de bloques de líneas completas: cada bloque tiene alrededor
+    de `block_size` bytes y termina en un salto de línea (salvo el último si
+    el archivo no termina en uno). Sirve para parsers por lotes, como el
+    lector JSON de Arrow, que necesitan líneas enteras. Con rango devuelve
+    las líneas que comienzan dentro de [start, end). Con `depth` los bloques
+    se leen en un hilo en segundo plano; los archivos comprimidos se
+    descomprimen siempre así y solo se leen completos.
+
+    Parameters:
+        file_path (str): Ruta al archivo NDJSON
+        block_size (int): Bytes aproximados por bloque
+        start (int): Byte de inicio del rango (debe ser inicio de línea)
+        end (Optional[int]): Byte de fin del rango, None para leer hasta el final
+        depth (int): Bloques que se leen por adelantado, 0 para leer en el mismo hilo
+    Yields:
+        bytes: Bloque de líneas
+    """
+    if compression_of(file_path) is not None:
+        if start != 0 or end is not None:
+            raise ValueError('Los archivos comprimidos no admiten lectura por rangos')
+        blocks = prefetch_blocks(open_decompressed(file_path), block_size, depth or QUEUE_DEPTH)
+    else:
+        blocks = _file_blocks(file_path, block_size, start, end)
+        if depth:
+            blocks = prefetch(blocks, depth)
+
+    rest = b''
+    for block in blocks:
+        block = rest + block
+        cut = block.rfind(b'\n') + 1
+        if cut == 0:  # Una línea más larga que el bloque: sigo acumulando
+            rest = block
+            continue
+        rest = block[cut:]
+        yield block[:cut]
+    if rest:
+        yield rest
+
+
+def _file_blocks(file_path: str, block_size: int, start: int = 0, end: Optional[int] = None) -> Generator[bytes, None, None]:
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        remaining = None if end is None else end - start
+        last = b'\n'
+        while remaining is None or remaining > 0:
+            block = f.read(block_size if remaining is None else min(block_size, remaining))
+            if not block:
+                return
+            if remaining is not None:
+                remaining -= len(block)
+            last = block[-1:]
+            yield block
+        # La última línea que comienza en el rango puede terminar después de `end`
+        if last != b'\n':
+            tail = f.readline()
+            if tail:
+                yield tail
+
+
+def split_ranges(file_path: str, parts: int, start: int = 0, end: Optional[int] = None) -> List[Tuple[int, int]]:
+    """Divide el archivo (o la porción [start, end)) en rangos de bytes
+    alineados a saltos de línea, de modo que cada línea pertenece a
+    exactamente un rango.
+
+    Parameters:
+        file_path (str): Ruta al archivo NDJSON
+        parts (int): Cantidad de rangos deseada
+        start (int): Byte de inicio de la porción (debe ser inicio de línea)
+        end (Optional[int]): Byte de fin de la porción, None para el final del archivo
+    Returns:
+        (List[Tuple[int, int]]): Lista de rangos (inicio, fin)
+    """
+    size = os.path.getsize(file_path) if end is None else end
+    boundaries = [start]
+
+    with open(file_path, 'rb') as f:
+        for index in range(1, parts):
+            offset = start + (size - start) * index // parts
+            if offset <= boundaries[-1]:
+                continue
+            # Retrocedo un byte para no saltar una línea que empieza justo en offset
+            f.seek(offset - 1)
+            f.readline()
+            boundary = min(f.tell(), size)
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+
+    boundaries.append(size)
+    return [
+        (start, end)
+        for start, end in zip(boundaries, boundaries[1:])
+        if start < end
+    ]
+
+
+def last_line_end(file_path: str) -> int:
+    """Posición inmediatamente posterior al último salto de línea del
+    archivo, es decir, el fin de la última línea completa. Lo que sigue
+    puede ser una línea que todavía se está escribiendo.
+
+    Parameters:
+        file_path (str): Ruta al archivo NDJSON
+    Returns:
+        int: Byte de fin de la última línea completa (0 si no hay ninguna)
+    """
+    size = os.path.getsize(file_path)
+    block = 64 * 1024
+    with open(file_path, 'rb') as f:
+        position = size
+        while position > 0:
+            start = max(position - block, 0)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b'\n')
+            if newline != -1:
+                return start + newline + 1
+            position = start
+    return 0
@@ -0,0 +1,394 @@
+# imports nativos
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+import os
+import pickle
+
+# imports externas
+from rich import print
+
+# imports propios
+from .tracing import span
+from .readers import (
+    decode_batches,
+    split_ranges,
+    last_line_end,
+    expand_paths,
+    describe_paths,
+    FilePaths,
+    BATCH_DECODER,
+)
+from .aggregators import Accumulator
+from .cache import checkpoint_path, load_checkpoint, save_checkpoint
+from .compression import compression_of
+from .filters import TweetFilter
+from .prefetch import Prefetch
+
+
+# Porción de un archivo a escanear: (ruta, byte de inicio, byte de fin o None)
+Segment = Tuple[str, int, Optional[int]]
+
+
+def run_scan(
+    file_path: FilePaths,
+    accumulators: List[Accumulator],
+    workers: Optional[int] = 1,
+    checkpoint_dir: Optional[str] = None,
+    tweet_filter: Optional[TweetFilter] = None,
+    prefetch: Optional[Prefetch] = None
+) -> List[list]:
+    """Escanea el archivo NDJSON una sola vez y reparte cada tweet entre
+    todos los acumuladores registrados. Así, responder varias preguntas
+    cuesta una única lectura y decodificación del archivo.
+
+    La entrada puede ser también una lista de rutas, un patrón glob o una
+    carpeta (ver `expand_paths`): los archivos se procesan como si fueran
+    uno solo, concatenados en ese orden.
+
+    Con `workers > 1` la entrada se reparte en tareas de tamaño parecido:
+    los archivos grandes se dividen en rangos de bytes alineados a saltos de
+    línea y los chicos consecutivos se agrupan (ver `_plan_tasks`). Cada
+    proceso llena sus propios acumuladores y los parciales se combinan con
+    `merge` en el orden de la entrada, por lo que el resultado es idéntico
+    al del escaneo secuencial.
+
+    Con `checkpoint_dir` el estado de los acumuladores se guarda, por
+    archivo, junto con el byte hasta el que se leyó. Si el archivo solo
+    creció desde entonces, la siguiente ejecución lee únicamente las líneas
+    agregadas; si se truncó o se reescribió, se vuelve a escanear completo
+    (ver `_incremental_scan`).
+
+    Los archivos comprimidos (.gz, .bz2, .zst) se descomprimen en un hilo en
+    segundo plano mientras se procesan, siempre en un único escaneo completo
+    por archivo.
+
+    Con `tweet_filter` solo los tweets del rango de fechas (y de los autores)
+    pedidos llegan a los acumuladores. Las líneas fuera del rango se
+    descartan mirando el prefijo de `date` en la línea cruda, antes de
+    decodificarlas (ver `TweetFilter.accepts_line`).
+
+    Con `prefetch` cada proceso lee su porción por bloques desde un hilo en
+    segundo plano, con una cola acotada, mientras decodifica y agrega (ver
+    `utils.prefetch`). Conviene cuando la lectura espera al disco o
+    a la red, por ejemplo en volúmenes montados por red.
+
+    Parameters:
+        file_path (FilePaths): Ruta al archivo NDJSON, lista de rutas, patrón glob o carpeta
+        accumulators (List[Accumulator]): Acumuladores a alimentar
+        workers (Optional[int]): Procesos a utilizar, None para usar todos los núcleos
+        checkpoint_dir (Optional[str]): Carpeta para los checkpoints, None para no usarlos
+        tweet_filter (Optional[TweetFilter]): Filtro de fechas y autores, None para todos los tweets
+        prefetch (Optional[Prefetch]): Bloque y profundidad de la lectura anticipada, None para leer
+            en el mismo hilo
+    Returns:
+        (List[list]): Resultado de cada acumulador, en el mismo orden
+    """
+    results = [[] for _ in accumulators]
+
+    with span('run_scan', file=describe_paths(file_path)) as scan:
+        try:
+            # Etapa 1: Lectura y procesamiento línea por línea
+            with span('read') as read:
+                paths = expand_paths(file_path)
+                workers = workers or os.cpu_count() or 1
+                if len(paths) == 1 and compression_of(paths[0]) is not None:
+                    # Un flujo comprimido no se puede dividir por rangos de bytes ni
+                    # retomar desde un byte: se lee completo en un solo proceso
+                    if workers > 1 or checkpoint_dir is not None:
+                        print("Archivo comprimido: se escanea completo en un solo proceso")
+                    workers, checkpoint_dir = 1, None
+                scan.attributes['workers'] = workers
+                scan.attributes['files'] = len(paths)
+                scan.attributes['decoder'] = BATCH_DECODER
+                if prefetch is not None:
+                    scan.attributes['prefetch'] = repr(prefetch)
+
+                if checkpoint_dir is None:
+                    failed, read.rows = _scan(
+                        [(path, 0, None) for path in paths], accumulators, workers, tweet_filter, prefetch
+                    )
+                    # Bytes de los archivos en disco (comprimidos, si lo están)
+                    read.bytes = sum(os.path.getsize(path) for path in paths)
+                else:
+                    accumulators, failed, read.rows, read.bytes = _incremental_scan_files(
+                        paths, accumulators, workers, checkpoint_dir, tweet_filter, prefetch
+                    )
+
+            # Etapa 2: Procesamiento de resultados
+            with span('query'):
+                results = [
+                    [] if index in failed else accumulator.result()
+                    for index, accumulator in enumerate(accumulators)
+                ]
+            scan.rows, scan.bytes = read.rows, read.bytes
+
+        except Exception as e:
+            print(f"Error al procesar el archivo: {e}")
+            results = [[] for _ in accumulators]
+
+    return results
+
+
+def _scan(
+    segments: List[Segment],
+    accumulators: List[Accumulator],
+    workers: int,
+    tweet_filter: Optional[TweetFilter] = None,
+    prefetch: Optional[Prefetch] = None
+) -> Tuple[Set[int], int]:
+    """Alimenta los acumuladores con las líneas de los segmentos, en orden,
+    en un solo proceso o en paralelo.
+
+    Returns:
+        tuple: (índices de los acumuladores que fallaron, tweets leídos)
+    """
+    if workers > 1:
+        tasks = _plan_tasks(segments, workers)
+        if len(tasks) > 1:
+            return _parallel_scan(tasks, accumulators, workers, tweet_filter, prefetch)
+    return _feed(_read_segments(segments, tweet_filter, prefetch), accumulators)
+
+
+def _plan_tasks(segments: List[Segment], parts: int) -> List[List[Segment]]:
+    """Reparte los segmentos en alrededor de `parts` tareas de tamaño
+    parecido, sin alterar su orden. Un segmento de un archivo plano más
+    grande que una tarea se divide en rangos alineados a saltos de línea
+    (cada uno es una tarea); los segmentos chicos consecutivos, como los
+    fragmentos horarios, se agrupan en una misma tarea. Un archivo
+    comprimido no se puede dividir y es siempre un único segmento.
+
+    Returns:
+        (List[List[Segment]]): Tareas, cada una con sus segmentos en orden
+    """
+    sizes = [_segment_size(segment) for segment in segments]
+    target = max(sum(sizes) / parts, 1)
+
+    tasks = []
+    current, current_size = [], 0
+    for (path, start, end), size in zip(segments, sizes):
+        if size > target and compression_of(path) is None:
+            if current:
+                tasks.append(current)
+                current, current_size = [], 0
+            tasks.extend(
+                [(path, range_start, range_end)]
+                for range_start, range_end in split_ranges(path, round(size / target), start, end)
+            )
+            continue
+
+        current.append((path, start, end))
+        current_size += size
+        if current_size >= target:
+            tasks.append(current)
+            current, current_size = [], 0
+    if current:
+        tasks.append(current)
+    return tasks
+
+
+def _segment_size(segment: Segment) -> int:
+    path, start, end = segment
+    return (os.path.getsize(path) if end is None else end) - start
+
+
+def _incremental_scan(
+    file_path: str,
+    accumulators: List[Accumulator],
+    workers: int,
+    checkpoint_dir: str,
+    tweet_filter: Optional[TweetFilter] = None,
+    prefetch: Optional[Prefetch] = None
+) -> Tuple[List[Accumulator], Set[int], int, int]:
+    """Retoma el escaneo desde el último checkpoint válido y guarda uno nuevo.
+
+    El checkpoint se identifica por el archivo y por los acumuladores vacíos
+    (su tipo y configuración), y guarda su estado hasta el fin de la última
+    línea completa. Una última línea sin salto de línea puede estar
+    escribiéndose: se suma al resultado de esta ejecución pero no al
+    checkpoint, y se vuelve a leer en la próxima.
+
+    Returns:
+        tuple: (acumuladores con el estado final, índices de los que fallaron,
+            tweets leídos, byte desde el que se leyó)
+    """
+    schema = pickle.dumps(accumulators).hex()
+    if tweet_filter is not None:  # Con otro filtro el estado guardado no sirve
+        schema += repr(tweet_filter)
+    path = checkpoint_path(file_path, checkpoint_dir, schema=schema)
+
+    start = 0
+    saved = None
+    checkpoint = load_checkpoint(file_path, path)
+    if checkpoint is not None:
+        saved, start = checkpoint
+        print(f"Checkpoint: se leen solo los bytes agregados desde el byte {start:,}")
+    elif os.path.exists(path):
+        print("El archivo se truncó o reescribió desde el último checkpoint: escaneo completo")
+
+    # Las líneas nuevas se acumulan aparte (los procesos del escaneo en
+    # paralelo reciben acumuladores vacíos) y se combinan sobre lo guardado
+    end = last_line_end(file_path)
+    failed, rows = _scan([(file_path, start, end)], accumulators, workers, tweet_filter, prefetch)
+    if saved is not None:
+        for accumulator, fresh in zip(saved, accumulators):
+            accumulator.merge(fresh)
+        accumulators = saved
+
+    if failed:  # No se guarda un estado incompleto
+        return accumulators, failed, rows, start
+
+    save_checkpoint(file_path, path, accumulators, end)
+
+    if end < os.path.getsize(file_path):
+        failed, tail_rows = _scan([(file_path, end, None)], accumulators, 1, tweet_filter, prefetch)
+        rows += tail_rows
+    return accumulators, failed, rows, start
+
+
+def _incremental_scan_files(
+    paths: List[str],
+    accumulators: List[Accumulator],
+    workers: int,
+    checkpoint_dir: str,
+    tweet_filter: Optional[TweetFilter] = None,
+    prefetch: Optional[Prefetch] = None
+) -> Tuple[List[Accumulator], Set[int], int, int]:
+    """Escaneo incremental de varios archivos: cada uno tiene su propio
+    checkpoint (ver `_incremental_scan`), de modo que al llegar un fragmento
+    nuevo solo se lee ese fragmento. Los estados se combinan en el orden de
+    la entrada. Los archivos comprimidos se escanean completos.
+
+    Returns:
+        tuple: (acumuladores con el estado final, índices de los que fallaron,
+            tweets leídos, bytes leídos)
+    """
+    # Cada archivo parte de una copia de los acumuladores vacíos, que es
+    # además lo que identifica a su checkpoint
+    empty = pickle.dumps(accumulators)
+    merged = None
+    failed = set()
+    rows = bytes_read = 0
+
+    for path in paths:
+        file_accumulators = pickle.loads(empty)
+        if compression_of(path) is not None:
+            print(f"Archivo comprimido: {path} se escanea completo, sin checkpoint")
+            file_failed, file_rows = _scan([(path, 0, None)], file_accumulators, 1, tweet_filter, prefetch)
+            start = 0
+        else:
+            file_accumulators, file_failed, file_rows, start = _incremental_scan(
+                path, file_accumulators, workers, checkpoint_dir, tweet_filter, prefetch
+            )
+        failed |= file_failed
+        rows += file_rows
+        bytes_read += os.path.getsize(path) - start
+
+        if merged is None:
+            merged = file_accumulators
+        else:
+            for accumulator, partial in zip(merged, file_accumulators):
+                accumulator.merge(partial)
+
+    return merged, failed, rows, bytes_read
+
+
+def _feed(tweets: Iterable[dict], accumulators: List[Accumulator]) -> Tuple[Set[int], int]:
+    """Reparte cada tweet entre los acumuladores. Un acumulador que falla se
+    descarta sin interrumpir a los demás, igual que si cada pregunta se
+    hubiese ejecutado por separado.
+
+    Returns:
+        tuple: (índices de los acumuladores que fallaron, tweets leídos)
+    """
+    failed = set()
+    rows = 0
+    active = list(enumerate(accumulators))
+    for rows, tweet in enumerate(tweets, 1):
+        for index, accumulator in active:
+            try:
+                accumulator.update(tweet)
+            except Exception as e:
+                print(f"Error al procesar el archivo: {e}")
+                failed.add(index)
+        if len(active) + len(failed) > len(accumulators):
+            active = [(index, a) for index, a in active if index not in failed]
+    return failed, rows
+
+
+def _parallel_scan(
+    tasks: List[List[Segment]],
+    accumulators: List[Accumulator],
+    workers: int,
+    tweet_filter: Optional[TweetFilter] = None,
+    prefetch: Optional[Prefetch] = None
+) -> Tuple[Set[int], int]:
+    """Ejecuta las tareas en un pool de procesos y combina los acumuladores
+    parciales sobre `accumulators`. Cada proceso mantiene solo el estado
+    agregado de su tarea, así que la memoria por proceso queda acotada por
+    la cardinalidad de los contadores y no por el tamaño de la entrada.
+
+    Returns:
+        tuple: (índices de los acumuladores que fallaron en alguna tarea, tweets leídos)
+    """
+    failed = set()
+    rows = 0
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        futures = [
+            executor.submit(_scan_task, segments, accumulators, tweet_filter, prefetch)
+            for segments in tasks
+        ]
+        # Combino en el orden de la entrada para conservar el desempate de Counter
+        for future in futures:
+            partials, partial_failed, partial_rows = future.result()
+            failed |= partial_failed
+            rows += partial_rows
+            for accumulator, partial in zip(accumulators, partials):
+                accumulator.merge(partial)
+
+    return failed, rows
+
+
+def _scan_task(
+    segments: List[Segment],
+    accumulators: List[Accumulator],
+    tweet_filter: Optional[TweetFilter] = None,
+    prefetch: Optional[Prefetch] = None
+):
+    """Tarea de un proceso: llena los acumuladores con sus segmentos, en orden.
+
+    Returns:
+        tuple: (acumuladores parciales, índices de los que fallaron, tweets leídos)
+    """
+    failed, rows = _feed(_read_segments(segments, tweet_filter, prefetch), accumulators)
+    return accumulators, failed, rows
+
+
+def _read_segments(
+    segments: List[Segment],
+    tweet_filter: Optional[TweetFilter] = None,
+    prefetch: Optional[Prefetch] = None
+) -> Iterator[dict]:
+    """Tweets de todos los segmentos, uno a continuación del otro."""
+    return chain.from_iterable(
+        _read_tweets(path, start, end, tweet_filter, prefetch)
+        for path, start, end in segments
+    )
+
+
+def _read_tweets(
+    file_path: str,
+    start: int = 0,
+    end: Optional[int] = None,
+    tweet_filter: Optional[TweetFilter] = None,
+    prefetch: Optional[Prefetch] = None
+) -> Iterator[dict]:
+    """Decodifica los tweets por lotes (ver `decode_batches`) y los aplana
+    con `chain`, sin un generador de Python por tweet. Con `tweet_filter`
+    el lector descarta las líneas fuera del rango de fechas antes de
+    decodificarlas y los tweets decodificados se vuelven a filtrar.
+    """
+    line_filter = None if tweet_filter is None else tweet_filter.accepts_line
+    tweets = chain.from_iterable(decode_batches(file_path, start, end, line_filter, prefetch))
+    return tweets if tweet_filter is None else filter(tweet_filter.accepts, tweets)
@@ -0,0 +1,330 @@
+# imports nativos
+from typing import Callable, Dict, List, Optional
+from contextlib import contextmanager
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+# imports externas
+from rich.console import Console
+from rich.table import Table
+
+# imports propios
+from . import utils
+from .utils import measure_memory, PeakMemorySampler
+
+
+class Span:
+    """Fase medida de una ejecución. Las fases se anidan: cada span conoce a
+    su padre y a sus hijos, y el span raíz (sin padre) registra además el
+    pico de memoria de toda la ejecución.
+
+    `rows` y `bytes` los completa el código medido; con ellos se calcula el
+    rendimiento de la fase (filas/s y MB/s).
+    """
+
+    def __init__(self, name: str, parent: Optional['Span'] = None, **attributes):
+        self.name = name
+        self.parent = parent
+        self.attributes = attributes
+        self.children: List['Span'] = []
+        self.rows: Optional[int] = None
+        self.bytes: Optional[int] = None
+        self.error: Optional[str] = None
+        self.start = 0.0
+        self.end = 0.0
+        self.memory_start = 0.0
+        self.memory_end = 0.0
+        self.memory_peak: Optional[float] = None
+
+    @property
+    def path(self) -> str:
+        """Nombre completo del span, con los de sus ancestros ('run_scan/read')."""
+        return self.name if self.parent is None else f"{self.parent.path}/{self.name}"
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    @property
+    def rows_per_second(self) -> Optional[float]:
+        if self.rows is None or self.duration <= 0:
+            return None
+        return self.rows / self.duration
+
+    @property
+    def mb_per_second(self) -> Optional[float]:
+        if self.bytes is None or self.duration <= 0:
+            return None
+        return self.bytes / 1024 / 1024 / self.duration
+
+    def walk(self, depth: int = 0):
+        """Recorre el span y sus descendientes en orden, con su profundidad."""
+        yield self, depth
+        for child in self.children:
+            yield from child.walk(depth + 1)
+
+    def to_dict(self) -> dict:
+        return {
+            'span': self.path,
+            'duration_s': self.duration,
+            'rows': self.rows,
+            'bytes': self.bytes,
+            'rows_per_s': self.rows_per_second,
+            'mb_per_s': self.mb_per_second,
+            'memory_mb': self.memory_end,
+            'peak_memory_mb': self.memory_peak,
+            'error': self.error,
+            **self.attributes,
+        }
+
+
+class Tracer:
+    """Registra spans anidados y los exporta a los sinks al cerrar cada span
+    raíz. Cada hilo tiene su propia pila de spans activos.
+
+    Parameters:
+        sinks (Optional[List]): Destinos de los spans (objetos con `export(span)`)
+    """
+
+    def __init__(self, sinks: Optional[list] = None):
+        self.sinks = list(sinks) if sinks is not None else [ConsoleSink()]
+        self._local = threading.local()
+
+    def current(self) -> Optional[Span]:
+        """Span activo del hilo actual, None fuera de cualquier span."""
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Mide el bloque como un span hijo del span activo.
+
+        Parameters:
+            name (str): Nombre de la fase
+            **attributes: Datos adicionales del span (archivo, cantidad de workers, etc.)
+        Yields:
+            Span: Span en curso, para completar `rows` y `bytes`
+        """
+        stack = self._local.__dict__.setdefault('stack', [])
+        parent = stack[-1] if stack else None
+        span = Span(name, parent, **attributes)
+        if parent is not None:
+            parent.children.append(span)
+
+        sampler = PeakMemorySampler().start() if parent is None else None
+        span.memory_start = measure_memory()
+        stack.append(span)
+        span.start = time.perf_counter()
+        try:
+            yield span
+        except Exception as e:
+            span.error = str(e)
+            raise
+        finally:
+            span.end = time.perf_counter()
+            stack.pop()
+            span.memory_end = measure_memory()
+            if sampler is not None:
+                span.memory_peak = max(sampler.stop(), span.memory_end)
+                self._export(span)
+
+    def trace(self, name: Optional[str] = None) -> Callable:
+        """Decorador que mide cada llamada a la función como un span.
+
+        Parameters:
+            name (Optional[str]): Nombre del span, por defecto el de la función
+        """
+        def decorator(function: Callable) -> Callable:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(name or function.__name__):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _export(self, span: Span) -> None:
+        if not utils._metrics_enabled:
+            return
+        for sink in self.sinks:
+            try:
+                sink.export(span)
+            except Exception as e:  # Un sink roto no interrumpe la ejecución medida
+                print(f"Error al exportar métricas: {e}", file=sys.stderr)
+
+
+# Nombres de las fases que muestra la consola: (tabla de tiempo, tabla de memoria)
+PHASE_LABELS = {
+    'connection': ('Conexión y preparación', 'Después de conexión'),
+    'read': ('Lectura del archivo', 'Después de lectura'),
+    'query': ('Análisis y consulta', 'Después de consulta'),
+}
+
+
+class ConsoleSink:
+    """Imprime cada ejecución como tablas Rich de tiempo (con filas/s y
+    MB/s por fase) y de memoria."""
+
+    def __init__(self, console: Optional[Console] = None):
+        self.console = console or Console()
+
+    def export(self, root: Span) -> None:
+        time_table = Table(title="📊 [bold]Métricas de Tiempo[/bold]", show_header=True, header_style="bold magenta")
+        time_table.add_column("Fase", style="cyan")
+        time_table.add_column("Duración", justify="right")
+        time_table.add_column("Filas", justify="right")
+        time_table.add_column("Filas/s", justify="right")
+        time_table.add_column("MB/s", justify="right")
+
+        mem_table = Table(title="💾 [bold]Métricas de Memoria (MB)[/bold]", show_header=True, header_style="bold blue")
+        mem_table.add_column("Fase", style="cyan")
+        mem_table.add_column("Valor", justify="right")
+        mem_table.add_column("Δ", justify="right")
+        mem_table.add_row("Memoria base", f"{root.memory_start:.2f}", "")
+
+        previous = root.memory_start
+        for span, depth in root.walk():
+            if depth == 0:
+                continue
+            time_label, memory_label = PHASE_LABELS.get(span.name, (span.name, f"Después de {span.name}"))
+            time_table.add_row(
+                "  " * (depth - 1) + time_label,
+                f"{span.duration:.4f} segundos",
+                _format(span.rows, "{:,}"),
+                _format(span.rows_per_second, "{:,.0f}"),
+                _format(span.mb_per_second, "{:,.1f}"),
+            )
+            if depth == 1:
+                color = 'red' if span.memory_end > previous else 'green'
+                mem_table.add_row(
+                    memory_label,
+                    f"{span.memory_end:.2f}",
+                    f"[{color}]{span.memory_end - previous:+.2f}[/{color}]"
+                )
+                previous = span.memory_end
+
+        time_table.add_row(
+            "[bold]TOTAL[/bold]",
+            f"[bold]{root.duration:.4f} segundos[/bold]",
+            _format(root.rows, "{:,}"),
+            _format(root.rows_per_second, "{:,.0f}"),
+            _format(root.mb_per_second, "{:,.1f}"),
+        )
+        mem_table.add_row("[bold]Consumo máximo[/bold]", f"[bold]{root.memory_peak:.2f}[/bold]", "")
+
+        self.console.print(time_table)
+        self.console.print(mem_table)
+
+
+class JsonLinesSink:
+    """Escribe una línea JSON por span (incluidos los anidados), para que
+    otro proceso las recolecte sin leer las tablas de la consola.
+
+    Parameters:
+        target (str | IO): Ruta del archivo (se agregan líneas al final) o flujo de texto
+    """
+
+    def __init__(self, target='-'):
+        self.target = target
+
+    def export(self, root: Span) -> None:
+        timestamp = time.time()
+        lines = [
+            json.dumps({'timestamp': timestamp, **span.to_dict()}, default=str)
+            for span, _ in root.walk()
+        ]
+        text = '\n'.join(lines) + '\n'
+        if self.target == '-':
+            sys.stdout.write(text)
+        elif isinstance(self.target, str):
+            with open(self.target, 'a') as f:
+                f.write(text)
+        else:
+            self.target.write(text)
+
+
+class PrometheusSink:
+    """Mantiene un archivo en formato de exposición de texto de Prometheus
+    (para el textfile collector de node_exporter) con métricas acumuladas
+    por span: duración, filas, bytes y pico de memoria de la última ejecución.
+    El archivo se reescribe de forma atómica después de cada ejecución.
+
+    Parameters:
+        path (str): Ruta del archivo .prom
+        prefix (str): Prefijo de los nombres de las métricas
+    """
+
+    def __init__(self, path: str, prefix: str = 'tweets'):
+        self.path = path
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.metrics: Dict[str, Dict[str, float]] = {}
+
+    def export(self, root: Span) -> None:
+        with self.lock:
+            for span, _ in root.walk():
+                metrics = self.metrics.setdefault(span.path, {
+                    'span_duration_seconds_total': 0.0,
+                    'span_runs_total': 0,
+                    'span_rows_total': 0,
+                    'span_bytes_total': 0,
+                    'span_errors_total': 0,
+                })
+                metrics['span_duration_seconds_total'] += span.duration
+                metrics['span_runs_total'] += 1
+                metrics['span_rows_total'] += span.rows or 0
+                metrics['span_bytes_total'] += span.bytes or 0
+                metrics['span_errors_total'] += span.error is not None
+                metrics['span_last_duration_seconds'] = span.duration
+                if span.memory_peak is not None:
+                    metrics['span_peak_memory_bytes'] = span.memory_peak * 1024 * 1024
+            self._write()
+
+    def _write(self) -> None:
+        names = list(dict.fromkeys(name for metrics in self.metrics.values() for name in metrics))
+        lines = []
+        for name in names:
+            full_name = f"{self.prefix}_{name}"
+            kind = 'counter' if name.endswith('_total') else 'gauge'
+            lines.append(f"# TYPE {full_name} {kind}")
+            for path, metrics in self.metrics.items():
+                if name in metrics:
+                    label = path.replace('\\', '\\\\').replace('"', '\\"')
+                    lines.append(f'{full_name}{{span="{label}"}} {metrics[name]}')
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, self.path)
+
+
+def _format(value, pattern: str) -> str:
+    return '' if value is None else pattern.format(value)
+
+
+# Tracer global que usan los motores de consulta
+tracer = Tracer()
+
+
+def span(name: str, **attributes):
+    """Span sobre el tracer global (ver `Tracer.span`)."""
+    return tracer.span(name, **attributes)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorador sobre el tracer global (ver `Tracer.trace`)."""
+    return tracer.trace(name)
+
+
+def set_sinks(sinks: list) -> None:
+    """Reemplaza los destinos del tracer global.
+
+    Parameters:
+        sinks (list): Sinks a utilizar, por ejemplo
+            `[ConsoleSink(), JsonLinesSink('spans.jsonl'), PrometheusSink('tweets.prom')]`;
+            una lista vacía no exporta nada
+    """
+    tracer.sinks = list(sinks)
@@ -1,80 +1,96 @@
 # imports nativos
-import time
+from typing import Optional
+import os
+import threading
 
-# imports externos
-from rich.console import Console
-from rich.table import Table
-from memory_profiler import memory_usage
+
+# Instrumentación activa: con la variable de entorno METRICS_ENABLED=0 (o
+# `set_metrics_enabled(False)`) no se mide memoria ni se imprimen tablas
+_metrics_enabled = os.environ.get('METRICS_ENABLED', '1').lower() not in ('0', 'false', 'no')
+
+# Intervalo entre muestras del hilo que registra el pico de memoria
+SAMPLE_INTERVAL = 0.01
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def set_metrics_enabled(enabled: bool) -> None:
+    """Activa o desactiva la medición de memoria y la impresión de métricas.
+
+    Parameters:
+        enabled (bool): False para no instrumentar (por ejemplo en producción)
+    """
+    global _metrics_enabled
+    _metrics_enabled = enabled
+
+
+def _read_rss() -> float:
+    """Memoria residente (RSS) del proceso en MB. En Linux se lee la
+    segunda columna de /proc/self/statm (páginas residentes), que no
+    bloquea ni muestrea; en otros sistemas se usa psutil.
+    """
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / 1024 / 1024
+    except OSError:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
 
 
 def measure_memory() -> float:
     """Función para medir el uso de memoria en el proceso actual
     Returns:
-        float: Uso de memoria en MB
+        float: Uso de memoria en MB, 0 si la instrumentación está desactivada
     """
-    return memory_usage(-1, interval=0.1, timeout=1)[0]
+    if not _metrics_enabled:
+        return 0.0
+    return _read_rss()
 
 
-def init_metrics() -> tuple[dict, dict]:
-    """Inicializa las métricas de tiempo y memoria para el seguimiento
-    Returns:
-        tuple: Diccionarios para métricas de tiempo y memoria
-    """
-    time_metrics = {
-        'start_total': time.time(),
-        'read_start': 0,
-        'read_end': 0,
-        'query_start': 0,
-        'query_end': 0
-    }
-    
-    mem_metrics = {
-        'before': 0,
-        'after_conn': 0,
-        'after_read': 0,
-        'after_query': 0
-    }
-
-    return (time_metrics, mem_metrics)
-
-
-def print_performance_table(time_metrics: dict, mem_metrics: dict):
-    """Imprime las métricas en una tabla estilo Rich
+class PeakMemorySampler:
+    """Registra el pico real de memoria residente con un hilo en segundo
+    plano que lee el RSS cada `interval` segundos, en lugar de depender de
+    unas pocas mediciones puntuales. Con la instrumentación desactivada no
+    se inicia el hilo y el pico es 0.
+
     Parameters:
-        time_metrics (dict): Diccionario con métricas de tiempo
-        mem_metrics (dict): Diccionario con métricas de memoria
+        interval (float): Segundos entre muestras
     """
-    
-    # Crear tabla de tiempos
-    time_table = Table(title="📊 [bold]Métricas de Tiempo[/bold]", show_header=True, header_style="bold magenta")
-    time_table.add_column("Fase", style="cyan")
-    time_table.add_column("Duración", justify="right")
-    
-    time_table.add_row("Conexión y preparación", f"{(time_metrics['read_start'] - time_metrics['start_total']):.4f} segundos")
-    time_table.add_row("Lectura del archivo", f"{(time_metrics['read_end'] - time_metrics['read_start']):.4f} segundos")
-    time_table.add_row("Análisis y consulta", f"{(time_metrics['query_end'] - time_metrics['query_start']):.4f} segundos")
-    time_table.add_row("[bold]TOTAL[/bold]", f"[bold]{(time_metrics['end_total'] - time_metrics['start_total']):.4f} segundos[/bold]")
-    
-    # Crear tabla de memoria
-    mem_table = Table(title="💾 [bold]Métricas de Memoria (MB)[/bold]", show_header=True, header_style="bold blue")
-    mem_table.add_column("Fase", style="cyan")
-    mem_table.add_column("Valor", justify="right")
-    mem_table.add_column("Δ", justify="right")
-    
-    mem_table.add_row("Memoria base", f"{mem_metrics['before']:.2f}", "")
-    mem_table.add_row("Después de conexión", 
-                     f"{mem_metrics['after_conn']:.2f}", 
-                     f"[green]{mem_metrics['after_conn']-mem_metrics['before']:+.2f}[/green]")
-    mem_table.add_row("Después de lectura", 
-                     f"{mem_metrics['after_read']:.2f}", 
-                     f"[green]{mem_metrics['after_read']-mem_metrics['after_conn']:+.2f}[/green]")
-    mem_table.add_row("Después de consulta", 
-                     f"{mem_metrics['after_query']:.2f}", 
-                     f"[red]{mem_metrics['after_query']-mem_metrics['after_read']:+.2f}[/red]")
-    mem_table.add_row("[bold]Consumo máximo[/bold]", 
-                     f"[bold]{max(mem_metrics.values()):.2f}[/bold]", "")
-    
-    # Imprimir tablas
-    console = Console()
-    console.print(time_table)
-    console.print(mem_table)
\ No newline at end of file
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'PeakMemorySampler':
+        if _metrics_enabled:
+            self.peak = _read_rss()
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> float:
+        """Detiene el muestreo.
+
+        Returns:
+            float: Pico de memoria en MB
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.peak = max(self.peak, _read_rss())
+        return self.peak
+
+    def __enter__(self) -> 'PeakMemorySampler':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            rss = _read_rss()
+            if rss > self.peak:
+                self.peak = rss